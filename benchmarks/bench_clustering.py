@@ -0,0 +1,71 @@
+"""Accuracy vs latency of the dominant-colour engines against full KMeans.
+
+    python benchmarks/bench_clustering.py [--sizes 20000 200000 800000]
+
+Uses synthetic HSV skin pixels (a seeded three-component mixture of skin,
+shadow and highlight tones), so it runs offline.  Error is the HSV distance
+between an engine's dominant colour and the one full KMeans finds.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skinsight.clustering import dominant_colors  # noqa: E402
+
+CONFIGS = [
+    ("kmeans", {}),
+    ("subsample", {"strategy": "random"}),
+    ("subsample", {"strategy": "stratified"}),
+    ("minibatch", {}),
+    ("histogram", {}),
+]
+
+
+def synthetic_skin(n, seed=0):
+    rng = np.random.default_rng(seed)
+    components = [
+        # (weight, mean HSV, std HSV)
+        (0.6, (12, 110, 190), (3, 18, 15)),
+        (0.25, (10, 130, 120), (4, 20, 20)),
+        (0.15, (15, 60, 235), (5, 15, 10)),
+    ]
+    sizes = rng.multinomial(n, [c[0] for c in components])
+    parts = [rng.normal(mean, std, size=(size, 3)) for size, (_, mean, std) in zip(sizes, components)]
+    pixels = np.concatenate(parts)
+    rng.shuffle(pixels)
+    pixels[:, 0] %= 180
+    return np.clip(pixels, 0, 255).astype(np.uint8)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20_000, 200_000, 800_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'pixels':>8} {'engine':<22} {'time (ms)':>10} {'speedup':>8} {'error':>7} {'weight':>7}")
+    for n in args.sizes:
+        pixels = synthetic_skin(n)
+        reference = None
+        for engine, options in CONFIGS:
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                centers, weights = dominant_colors(pixels, engine=engine, **options)
+                timings.append(time.perf_counter() - start)
+            elapsed = min(timings)
+            if reference is None:
+                reference = (elapsed, centers[0], weights[0])
+            error = np.linalg.norm(centers[0] - reference[1])
+            label = engine + (f"/{options['strategy']}" if options else "")
+            print(f"{n:>8} {label:<22} {elapsed * 1000:>10.1f} {reference[0] / elapsed:>7.1f}x "
+                  f"{error:>7.1f} {weights[0]:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Compare full-resolution face detection with downscaled detection.
+
+    python benchmarks/bench_detection.py photo.jpg [photo2.jpg ...] --max-side 800
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skinsight.detection import DETECT_MAX_SIDE, detect_faces  # noqa: E402
+from skinsight.models import get_models  # noqa: E402
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("images", nargs="+")
+    parser.add_argument("--max-side", type=int, default=DETECT_MAX_SIDE)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    detector, _ = get_models()
+    print(f"{'image':<32} {'size':>11} {'full (s)':>9} {'scaled (s)':>10} {'speedup':>8}  faces")
+    for path in args.images:
+        image = cv2.imread(path)
+        if image is None:
+            print(f"{path}: unreadable", file=sys.stderr)
+            continue
+        full_time, full_boxes = best_of(
+            lambda: detect_faces(image, detector, max_side=0), args.repeat)
+        scaled_time, scaled_boxes = best_of(
+            lambda: detect_faces(image, detector, max_side=args.max_side), args.repeat)
+        h, w = image.shape[:2]
+        print(f"{os.path.basename(path):<32} {w:>5}x{h:<5} {full_time:>9.3f} {scaled_time:>10.3f} "
+              f"{full_time / scaled_time:>7.1f}x  {len(full_boxes)}/{len(scaled_boxes)}")
+
+
+if __name__ == "__main__":
+    main()
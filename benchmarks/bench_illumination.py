@@ -0,0 +1,79 @@
+"""Latency and hue stability of the white-balance modes.
+
+    python benchmarks/bench_illumination.py [--megapixels 2] [--repeat 50]
+
+A synthetic portrait from the suite is re-lit with tungsten and
+fluorescent casts.  For every mode the table shows the time to estimate and
+apply the correction to the sampled face pixels, and the skin hue angle
+and chroma, which should stay close to the daylight values whatever the
+cast.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from skinsight.extraction import polygons_pixels  # noqa: E402
+from skinsight.features import bgr_to_lab, skin_features  # noqa: E402
+from skinsight.illumination import MODES, apply_gains, estimate_gains  # noqa: E402
+from suite import synthetic_image  # noqa: E402
+
+# Linear-light BGR multipliers that imitate each light source
+CASTS = {
+    "daylight": (1.0, 1.0, 1.0),
+    "tungsten": (0.55, 0.8, 1.0),
+    "fluorescent": (0.9, 1.0, 0.8),
+}
+
+
+def eye_polygons(image):
+    """The sclera ellipses ``synthetic_image`` draws for a single face."""
+    import cv2
+
+    height, width = image.shape[:2]
+    cx, cy = width // 2, height // 2
+    ax = int(min(width / 2, height) * 0.3)
+    ay = int(ax * 1.3)
+    return [cv2.ellipse2Poly((cx + side * ax // 2, cy - ay // 4), (ax // 6, ax // 12), 0, 0, 360, 10)
+            for side in (-1, 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--megapixels", type=float, default=2)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    daylight, faces = synthetic_image(args.megapixels)
+    eyes = eye_polygons(daylight)
+    print(f"{args.megapixels} MP portrait, {args.repeat} repeats")
+    print(f"{'cast':<12} {'mode':<12} {'p50 ms':>8} {'hue':>7} {'drift':>7} {'chroma':>7} {'drift':>7}"
+          "  gains (BGR)")
+    reference = {}
+    for cast, multipliers in CASTS.items():
+        image = apply_gains(daylight.reshape(-1, 3), np.array(multipliers)).reshape(daylight.shape)
+        skin = polygons_pixels(image, faces)[0]
+        eye = np.concatenate(polygons_pixels(image, eyes))
+        for mode in MODES:
+            times = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                gains = estimate_gains(mode, image, eye_bgr=eye, skin_bgr=skin)
+                corrected = apply_gains(skin, gains)
+                times.append(time.perf_counter() - start)
+            features = skin_features(bgr_to_lab(corrected))
+            chroma, hue = features[3], features[4]
+            # Drift is measured against the uncorrected daylight photo
+            reference = reference or {"chroma": chroma, "hue": hue}
+            print(f"{cast:<12} {mode:<12} {np.median(times) * 1000:>8.3f} {hue:>7.2f} "
+                  f"{hue - reference['hue']:>+7.2f} {chroma:>7.2f} {chroma - reference['chroma']:>+7.2f}  "
+                  f"{np.round(gains, 3).tolist()}")
+
+
+if __name__ == "__main__":
+    main()
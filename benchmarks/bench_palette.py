@@ -0,0 +1,42 @@
+"""Throughput of palette matching on a synthetic catalogue.
+
+    python benchmarks/bench_palette.py [--sizes 1000 100000 1000000]
+
+Scores seeded random hex colours against every season and reports SKUs
+per second, so it runs offline.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skinsight.features import hex_to_lab  # noqa: E402
+from skinsight.palette import load_palette_index  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--season", default="True Winter")
+    args = parser.parse_args()
+
+    index = load_palette_index()
+    print(f"{len(index)} palette entries across {len(index.seasons)} seasons")
+    rng = np.random.default_rng(0)
+    print(f"{'SKUs':>9} {'hex parse s':>12} {'score s':>9} {'SKUs/s':>11}")
+    for size in args.sizes:
+        codes = [f"#{value:06X}" for value in rng.integers(0, 1 << 24, size)]
+        start = time.perf_counter()
+        lab = hex_to_lab(codes)
+        parsed = time.perf_counter()
+        index.score_lab(lab)[:, index.seasons.index(args.season)]
+        done = time.perf_counter()
+        print(f"{size:>9} {parsed - start:>12.3f} {done - parsed:>9.3f} {size / (done - start):>11,.0f}")
+
+
+if __name__ == "__main__":
+    main()
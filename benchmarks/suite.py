@@ -0,0 +1,245 @@
+"""Reproducible performance suite for the analysis pipeline.
+
+    python benchmarks/suite.py                      # run and compare with baseline.json
+    python benchmarks/suite.py --quick              # small images only
+    python benchmarks/suite.py --save-baseline      # record a new baseline
+    python benchmarks/suite.py --images photos/     # add real photos to the run
+
+Inputs are synthetic, seeded "faces" (a skin-toned ellipse with eyes, brows
+and mouth on a gradient background) across image sizes, face counts and
+skin tones, so the suite needs no network or bundled photos.  End-to-end
+runs go through ``analyze_details`` and report its per-stage timings.  The
+extract/cluster stages are also timed on the known synthetic face polygon,
+so they are measured even when the HOG detector ignores a synthetic face.
+
+The results are p50/p95 latency, images/sec and the process peak RSS after
+each case.  A case whose p50 is slower than the baseline by more than
+``--tolerance`` is a regression and makes the run exit with status 1.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import resource
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skinsight.clustering import dominant_colors  # noqa: E402
+from skinsight.extraction import skin_pixels_hsv  # noqa: E402
+from skinsight.pipeline import PIPELINE_VERSION, analyze_details  # noqa: E402
+from skinsight.profiling import Profile  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# BGR skin tones
+TONES = {
+    "light": (180, 200, 240),
+    "medium": (120, 160, 210),
+    "deep": (60, 85, 125),
+}
+SIZES_MP = (0.3, 2, 12, 48)
+QUICK_SIZES_MP = (0.3, 2)
+
+
+def synthetic_image(megapixels, faces=1, tone="medium", seed=0):
+    """Return ``(bgr_image, face_polygons)`` for a seeded synthetic portrait."""
+    import cv2
+
+    rng = np.random.default_rng(seed)
+    width = int(round((megapixels * 1e6 * 4 / 3) ** 0.5))
+    height = int(round(width * 3 / 4))
+    ramp = np.linspace(60, 200, width, dtype=np.float32)
+    image = np.empty((height, width, 3), dtype=np.uint8)
+    image[:] = np.stack([ramp, ramp * 0.9, ramp * 0.8], axis=1).astype(np.uint8)
+
+    polygons = []
+    for i in range(faces):
+        cx = int(width * (i + 1) / (faces + 1))
+        cy = height // 2
+        ax = int(min(width / (faces + 1), height) * 0.3)
+        ay = int(ax * 1.3)
+        color = np.clip(np.array(TONES[tone]) + rng.normal(0, 8, 3), 0, 255).tolist()
+        cv2.ellipse(image, (cx, cy), (ax, ay), 0, 0, 360, color, -1)
+        for side in (-1, 1):
+            eye = (cx + side * ax // 2, cy - ay // 4)
+            cv2.ellipse(image, eye, (ax // 6, ax // 12), 0, 0, 360, (245, 245, 245), -1)
+            cv2.circle(image, eye, ax // 16, (40, 30, 20), -1)
+            brow = (cx + side * ax // 2, cy - ay // 2.5)
+            cv2.ellipse(image, (brow[0], int(brow[1])), (ax // 4, ax // 20), 0, 0, 360, (30, 30, 40), -1)
+        cv2.ellipse(image, (cx, cy + ay // 2), (ax // 3, ax // 10), 0, 0, 360, (70, 60, 170), -1)
+        polygons.append(cv2.ellipse2Poly((cx, cy), (int(ax * 0.8), int(ay * 0.8)), 0, 0, 360, 10))
+
+    noise = rng.normal(0, 4, image.shape)
+    image = np.clip(image + noise, 0, 255).astype(np.uint8)
+    return image, polygons
+
+
+def encode_jpeg(image, quality=90):
+    import cv2
+
+    ok, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise RuntimeError("JPEG encoding failed")
+    return buffer.tobytes()
+
+
+def percentile_ms(values, q):
+    return float(np.percentile(values, q) * 1000) if values else None
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_case(name, data, polygons, repeat, end_to_end=True, bgr=None):
+    totals, stages, faces_found = [], {}, 0
+    if end_to_end:
+        # The flat synthetic faces can look blurry; time the full pipeline anyway
+        analyze_details(io.BytesIO(data), all_faces=True, quality_gate=False)  # warm-up, not timed
+        for _ in range(repeat):
+            profile = Profile()
+            start = time.perf_counter()
+            result = analyze_details(io.BytesIO(data), profile=profile, all_faces=True, quality_gate=False)
+            totals.append(time.perf_counter() - start)
+            faces_found = len(result.faces) if result else 0
+            for stage, entry in profile.stages.items():
+                stages.setdefault(stage, []).append(entry["seconds"])
+
+    # Stage micro-benchmarks on the known face region
+    if bgr is not None and polygons:
+        dominant_colors(skin_pixels_hsv(bgr, polygons[0]), k=3)  # warm-up, not timed
+        for _ in range(repeat):
+            start = time.perf_counter()
+            pixels = skin_pixels_hsv(bgr, polygons[0])
+            stages.setdefault("extract[synthetic]", []).append(time.perf_counter() - start)
+            start = time.perf_counter()
+            dominant_colors(pixels, k=3)
+            stages.setdefault("cluster[synthetic]", []).append(time.perf_counter() - start)
+
+    return {
+        "name": name,
+        "p50_ms": percentile_ms(totals, 50),
+        "p95_ms": percentile_ms(totals, 95),
+        "images_per_sec": len(totals) / sum(totals) if totals else None,
+        "faces_found": faces_found,
+        "stages": {
+            stage: {"p50_ms": percentile_ms(values, 50), "p95_ms": percentile_ms(values, 95)}
+            for stage, values in stages.items()
+        },
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def synthetic_cases(sizes):
+    for mp in sizes:
+        for tone in TONES:
+            yield f"{mp}MP-1face-{tone}", dict(megapixels=mp, faces=1, tone=tone)
+    for faces in (0, 3):
+        yield f"2MP-{faces}face-medium", dict(megapixels=2, faces=faces, tone="medium")
+
+
+def image_cases(directory):
+    for filename in sorted(os.listdir(directory)):
+        if os.path.splitext(filename)[1].lower() in {".jpg", ".jpeg", ".png"}:
+            with open(os.path.join(directory, filename), "rb") as f:
+                yield f"file:{filename}", f.read()
+
+
+def compare(results, baseline, tolerance):
+    """Annotate ``results`` with p50 ratios and return the regressions."""
+    regressions = []
+    previous = {case["name"]: case for case in baseline.get("cases", [])}
+    for case in results:
+        old = previous.get(case["name"])
+        if not old:
+            continue
+        pairs = [(case["name"], case, old)]
+        pairs += [
+            (f"{case['name']}/{stage}", timing, old["stages"][stage])
+            for stage, timing in case["stages"].items() if stage in old.get("stages", {})
+        ]
+        for label, new_timing, old_timing in pairs:
+            if not new_timing.get("p50_ms") or not old_timing.get("p50_ms"):
+                continue
+            ratio = new_timing["p50_ms"] / old_timing["p50_ms"]
+            new_timing["vs_baseline"] = round(ratio, 3)
+            if ratio > 1 + tolerance:
+                regressions.append((label, old_timing["p50_ms"], new_timing["p50_ms"], ratio))
+    return regressions
+
+
+def _fmt(value, width, precision):
+    return f"{'-':>{width}}" if value is None else f"{value:>{width}.{precision}f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="only run the small image sizes")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--images", help="directory of extra photos to benchmark")
+    parser.add_argument("--stages-only", action="store_true",
+                        help="skip end-to-end runs (no dlib model needed)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p50 slowdown (0.2 = 20%%)")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    end_to_end = not args.stages_only
+    if end_to_end:
+        from skinsight.models import warm_up
+
+        warm_up()
+
+    results = []
+    for name, spec in synthetic_cases(QUICK_SIZES_MP if args.quick else SIZES_MP):
+        image, polygons = synthetic_image(**spec)
+        data = encode_jpeg(image)
+        results.append(run_case(name, data, polygons, args.repeat, end_to_end, bgr=image))
+        del image, data
+        print(f"  {results[-1]['name']}: done", file=sys.stderr)
+    if args.images and end_to_end:
+        for name, data in image_cases(args.images):
+            results.append(run_case(name, data, [], args.repeat))
+
+    print(f"{'case':<28} {'p50 ms':>9} {'p95 ms':>9} {'img/s':>7} {'RSS MB':>8} {'vs base':>8}  slowest stage (p50 ms)")
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    for case in results:
+        slowest = max(case["stages"].items(), key=lambda item: item[1]["p50_ms"], default=None)
+        print(f"{case['name']:<28} {_fmt(case['p50_ms'], 9, 1)} {_fmt(case['p95_ms'], 9, 1)} "
+              f"{_fmt(case['images_per_sec'], 7, 2)} {case['peak_rss_mb']:>8.1f} "
+              f"{_fmt(case.get('vs_baseline'), 7, 2)}x  "
+              + (f"{slowest[0]} {slowest[1]['p50_ms']:.1f}" if slowest else "-"))
+
+    report = {
+        "pipeline_version": PIPELINE_VERSION,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cases": results,
+    }
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+    elif regressions:
+        for name, old, new, ratio in regressions:
+            print(f"REGRESSION {name}: p50 {old:.1f} ms -> {new:.1f} ms ({ratio:.2f}x)", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""Skinsight colour-analysis engine.
+
+Importing the package is cheap: the season knowledge base is loaded on
+first use, and OpenCV, dlib and scikit-learn are only imported when an
+analysis actually runs.  The Streamlit app (``sta4.py``), the batch CLI
+and the HTTP service are thin clients of this package.
+"""
+import importlib
+
+_LAZY = {
+    "OCCASION_TYPES": "skinsight.knowledge",
+    "SEASONS": "skinsight.knowledge",
+    "load_knowledge_base": "skinsight.knowledge",
+    "PIPELINE_VERSION": "skinsight.pipeline",
+    "config_fingerprint": "skinsight.pipeline",
+    "analyze_details": "skinsight.pipeline",
+    "analyze_image": "skinsight.pipeline",
+    "ImageQualityError": "skinsight.quality",
+    "load_classifier": "skinsight.classifier",
+    "load_palette_index": "skinsight.palette",
+    "get_models": "skinsight.models",
+    "warm_up": "skinsight.models",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        return getattr(importlib.import_module(_LAZY[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,215 @@
+"""A consensus season from several photos of the same person.
+
+    python -m skinsight.aggregate selfie1.jpg selfie2.jpg window.jpg --workers 4
+    python -m skinsight.aggregate *.jpg --weighting pixel
+
+Each photo is analysed in a worker process.  Its largest face comes back
+as a fixed-size :class:`SkinStats` (pixel count, running Lab mean and sum
+of squares, and a lightness histogram) rather than pixels, and the stats
+are merged as results arrive.  The merged stats give the same features a
+single photo does (mean Lab, chroma, hue, ITA, lightness spread, and
+percentiles to the histogram's 0.25 L*), so the consensus is scored by the
+same classifier.  Memory is constant in the number of photos; pixels never
+leave the worker.
+
+By default every photo counts equally (``weighting="photo"``): each one's
+stats are scaled to unit weight before merging, so one close-up with ten
+times the skin pixels does not outvote the others.  ``weighting="pixel"``
+pools the pixels instead, as if the photos were one image.
+"""
+import argparse
+import io
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from skinsight.classifier import load_classifier
+from skinsight.features import FEATURE_NAMES, lab_features
+from skinsight.models import get_models, init_worker
+from skinsight.pipeline import analyze_details
+
+L_BINS = 400  # 0.25 L* per bin, finer than percentiles of real skin need
+WEIGHTINGS = ("photo", "pixel")
+
+
+class SkinStats:
+    """Mergeable summary of Lab skin pixels and their contrast scores.
+
+    ``count`` is the total weight: the pixel count, or any positive weight
+    after :meth:`scaled`.
+    """
+
+    __slots__ = ("count", "mean", "m2", "histogram", "contrast_sum", "contrast_weight")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = np.zeros(3)
+        self.m2 = np.zeros(3)
+        self.histogram = np.zeros(L_BINS)
+        self.contrast_sum = 0.0
+        self.contrast_weight = 0
+
+    @classmethod
+    def from_lab(cls, lab, contrast=None):
+        stats = cls()
+        stats.count = len(lab)
+        if stats.count:
+            stats.mean = lab.mean(axis=0)
+            stats.m2 = ((lab - stats.mean) ** 2).sum(axis=0)
+            bins = np.clip((lab[:, 0] * (L_BINS / 100)).astype(np.intp), 0, L_BINS - 1)
+            stats.histogram = np.bincount(bins, minlength=L_BINS)
+        if contrast is not None:
+            stats.contrast_sum = contrast * stats.count
+            stats.contrast_weight = stats.count
+        return stats
+
+    def scaled(self, weight=1.0):
+        """These stats with a total weight of ``weight``, the pixels' mix unchanged."""
+        stats = type(self)()
+        if self.count:
+            factor = weight / self.count
+            stats.count = weight
+            stats.mean = self.mean.copy()
+            stats.m2 = self.m2 * factor
+            stats.histogram = self.histogram * factor
+            stats.contrast_sum = self.contrast_sum * factor
+            stats.contrast_weight = self.contrast_weight * factor
+        return stats
+
+    def merge(self, other):
+        """Fold ``other`` into these stats (Chan et al.'s parallel variance update)."""
+        total = self.count + other.count
+        if other.count:
+            delta = other.mean - self.mean
+            self.mean = self.mean + delta * (other.count / total)
+            self.m2 = self.m2 + other.m2 + delta ** 2 * (self.count * other.count / total)
+            self.histogram += other.histogram
+            self.count = total
+        self.contrast_sum += other.contrast_sum
+        self.contrast_weight += other.contrast_weight
+        return self
+
+    def percentile(self, q):
+        cumulative = np.cumsum(self.histogram)
+        index = int(np.searchsorted(cumulative, q / 100 * self.count))
+        return (index + 0.5) * 100 / L_BINS
+
+    def features(self):
+        """The ``FEATURE_NAMES`` dict of the merged pixels."""
+        L, a, b = self.mean
+        L_std = np.sqrt(self.m2[0] / self.count)
+        values = lab_features(L, a, b, L_std, self.percentile(10), self.percentile(90))
+        return dict(zip(FEATURE_NAMES, values.round(3).tolist()))
+
+    @property
+    def contrast(self):
+        return self.contrast_sum / self.contrast_weight if self.contrast_weight else None
+
+
+def analyze_stats(index, name, data):
+    """Worker: the largest face's season and :class:`SkinStats` for one photo."""
+    collected = []
+
+    def collect(face, lab):
+        score = face.contrast and face.contrast["score"]
+        collected.append(SkinStats.from_lab(lab["skin"], score))
+
+    record = {"index": index, "id": name, "season": None, "scores": None, "error": None}
+    try:
+        result = analyze_details(io.BytesIO(data), on_face=collect)
+    except Exception as exc:
+        record["error"] = f"{type(exc).__name__}: {exc}"
+        return record, None
+    if result is None:
+        record["error"] = "no face detected"
+        return record, None
+    record.update(season=result.season, scores=result.scores)
+    return record, collected[0]
+
+
+def _read(source):
+    if isinstance(source, tuple):
+        return source
+    if isinstance(source, (bytes, bytearray)):
+        return None, bytes(source)
+    with open(source, "rb") as f:
+        return os.fspath(source), f.read()
+
+
+def aggregate(sources, workers=None, weighting="photo"):
+    """Analyse several photos of one person and return the consensus.
+
+    ``sources`` are paths, bytes or ``(name, bytes)`` pairs; they are read
+    lazily, so only a bounded number is in memory at once.  ``weighting``
+    is ``"photo"`` (every photo counts equally) or ``"pixel"`` (every skin
+    pixel does).  The result holds the consensus ``season`` and ``scores``,
+    the merged ``features`` and, per photo, its own season and
+    ``agreement`` (its score for the consensus season).
+    """
+    if weighting not in WEIGHTINGS:
+        raise ValueError(f"unknown weighting {weighting!r}; expected one of {', '.join(WEIGHTINGS)}")
+    classifier = load_classifier()
+    merged = SkinStats()
+    records = []
+    pixels = 0
+
+    def absorb(record, stats):
+        nonlocal pixels
+        records.append(record)
+        if stats is not None and stats.count:
+            pixels += stats.count
+            merged.merge(stats.scaled() if weighting == "photo" else stats)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        # Load the models here without init_worker's thread limits on the caller
+        get_models()
+        for i, source in enumerate(sources):
+            name, data = _read(source)
+            absorb(*analyze_stats(i, name or str(i), data))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+            pending = set()
+            for i, source in enumerate(sources):
+                name, data = _read(source)
+                pending.add(pool.submit(analyze_stats, i, name or str(i), data))
+                if len(pending) >= workers * 2:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        absorb(*future.result())
+            for future in wait(pending).done:
+                absorb(*future.result())
+
+    records.sort(key=lambda record: record["index"])
+    result = {"season": None, "scores": None, "features": None, "photos": len(records),
+              "faces": sum(r["season"] is not None for r in records), "pixels": pixels, "weighting": weighting,
+              "images": records}
+    if merged.count == 0:
+        return result
+    features = merged.features()
+    season, scores = classifier.classify(classifier.vectorize(features, merged.contrast))
+    result.update(season=season, scores=scores, features=features)
+    for record in records:
+        if record["scores"] is not None:
+            record["agreement"] = record["scores"][season]
+            record["agrees"] = record["season"] == season
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m skinsight.aggregate",
+                                     description="Consensus color season from several photos of one person.")
+    parser.add_argument("photos", nargs="+", help="photos of the same person")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--weighting", choices=WEIGHTINGS, default="photo",
+                        help="count every photo equally (default) or every skin pixel")
+    args = parser.parse_args(argv)
+    json.dump(aggregate(args.photos, args.workers, args.weighting), sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""Headless batch analysis of image folders and archives.
+
+    python -m skinsight.batch photos/ -o results.jsonl
+    python -m skinsight.batch photos.tar.gz -o results.parquet --workers 8
+
+Images are streamed from a directory, tar or zip archive and fanned out over
+a process pool; every worker loads the dlib models once.  Results are
+appended to a JSONL checkpoint as they complete, so an interrupted run
+resumes where it stopped.  Parquet output (needs ``pyarrow``) is written
+from the checkpoint at the end.  Records made under different settings
+(:func:`~skinsight.pipeline.pipeline_config`: versions, white balance,
+clustering engine, size limits) are redone on resume and left out of the
+Parquet file.  A worker that dies (e.g. a crash in native code) fails the
+images it had in flight; they are checkpointed as errors, so a resume
+does not retry them, and the pool is restarted.
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from skinsight.models import init_worker
+from skinsight.pipeline import analyze_details, config_fingerprint, pipeline_config
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+
+
+def _is_image(name):
+    return os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+
+
+def iter_images(path):
+    """Yield ``(name, bytes)`` for every image in a directory, tar or zip file."""
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for filename in sorted(files):
+                if _is_image(filename):
+                    full_path = os.path.join(root, filename)
+                    with open(full_path, "rb") as f:
+                        yield os.path.relpath(full_path, path), f.read()
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and _is_image(info.filename):
+                    yield info.filename, archive.read(info)
+    elif tarfile.is_tarfile(path):
+        # Stream mode: members are read in order without seeking back
+        with tarfile.open(path, "r|*") as archive:
+            for member in archive:
+                if member.isfile() and _is_image(member.name):
+                    yield member.name, archive.extractfile(member).read()
+    else:
+        raise ValueError(f"{path} is not a directory, tar or zip archive")
+
+
+def _versions():
+    """The versions a record was made with, and the fingerprint of all its settings."""
+    config = pipeline_config()
+    return {"pipeline_version": config["pipeline_version"], "classifier_version": config["classifier_version"],
+            "config": config_fingerprint()}
+
+
+def _is_current(record, fingerprint):
+    """Whether a checkpoint record was produced under the settings with this ``fingerprint``."""
+    return record.get("config") == fingerprint
+
+
+def load_checkpoint(path):
+    """Return the ids already recorded in a JSONL checkpoint.
+
+    A line cut short by a crash is truncated away so appends stay valid.
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    fingerprint = config_fingerprint()
+    with open(path, "rb+") as f:
+        valid_end = 0
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            record = json.loads(line)
+            if _is_current(record, fingerprint):
+                done.add(record["id"])
+            valid_end += len(line)
+        f.truncate(valid_end)
+    return done
+
+
+def _empty_record(name):
+    return {"id": name, **_versions(), "season": None, "confidence": None,
+            "margin": None, "scores": None, "dominant_colors": None, "weights": None, "timings": None,
+            "error": None}
+
+
+def process_image(name, data, all_faces=False):
+    start = time.perf_counter()
+    record = _empty_record(name)
+    try:
+        result = analyze_details(io.BytesIO(data), all_faces=all_faces)
+    except Exception as exc:
+        record["error"] = f"{type(exc).__name__}: {exc}"
+    else:
+        if result is None:
+            record["error"] = "no face detected"
+        else:
+            record.update(
+                season=result.season,
+                confidence=result.confidence,
+                margin=result.margin,
+                scores=result.scores,
+                dominant_colors=result.dominant_colors,
+                weights=result.weights,
+                timings=result.timings,
+            )
+            if all_faces:
+                record["faces"] = [face.as_dict() for face in result.faces]
+    record["seconds"] = time.perf_counter() - start
+    return record
+
+
+def write_parquet(jsonl_path, parquet_path):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("Parquet output requires pyarrow (pip install pyarrow)") from None
+    # Lines made under other settings stay in the checkpoint but not in the output
+    fingerprint = config_fingerprint()
+    with open(jsonl_path) as f:
+        records = [record for record in map(json.loads, f) if _is_current(record, fingerprint)]
+    pq.write_table(pa.Table.from_pylist(records), parquet_path)
+
+
+def _new_pool(workers):
+    return ProcessPoolExecutor(max_workers=workers, initializer=init_worker)
+
+
+def run(source, output, workers=None, progress_every=10.0, all_faces=False, log=sys.stderr):
+    parquet = output.endswith(".parquet")
+    checkpoint = output + ".jsonl" if parquet else output
+    done = load_checkpoint(checkpoint)
+    if done:
+        print(f"Resuming: {len(done)} images already processed", file=log)
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = workers * 4
+    processed = failed = 0
+    start = last_report = time.perf_counter()
+
+    pool = _new_pool(workers)
+    pending = {}  # future -> (image id, the pool it was submitted to)
+
+    def replace_pool(broken):
+        nonlocal pool
+        if pool is broken:
+            print("A worker process died; its images are recorded as failed and the pool restarted", file=log)
+            broken.shutdown(wait=False, cancel_futures=True)
+            pool = _new_pool(workers)
+
+    def submit(name, data):
+        try:
+            future = pool.submit(process_image, name, data, all_faces)
+        except BrokenProcessPool:
+            replace_pool(pool)
+            future = pool.submit(process_image, name, data, all_faces)
+        pending[future] = name, pool
+
+    with open(checkpoint, "a") as out:
+        def drain(return_when):
+            nonlocal processed, failed, last_report
+            finished, _ = wait(pending, return_when=return_when)
+            for future in finished:
+                name, owner = pending.pop(future)
+                try:
+                    record = future.result()
+                except BrokenProcessPool:
+                    # Which in-flight image killed the worker is unknown, so all of them are
+                    # checkpointed as failed; otherwise every resume would retry and crash again
+                    replace_pool(owner)
+                    record = dict(_empty_record(name), error="BrokenProcessPool: a worker process died", seconds=None)
+                out.write(json.dumps(record) + "\n")
+                processed += 1
+                failed += record["error"] is not None
+            out.flush()
+            now = time.perf_counter()
+            if now - last_report >= progress_every:
+                last_report = now
+                print(f"{processed} images, {processed / (now - start):.1f} images/sec", file=log)
+
+        try:
+            for name, data in iter_images(source):
+                if name in done:
+                    continue
+                submit(name, data)
+                # Bound the number of decoded files held in memory
+                if len(pending) >= max_pending:
+                    drain(FIRST_COMPLETED)
+            while pending:
+                drain(FIRST_COMPLETED)
+        finally:
+            pool.shutdown()
+
+    elapsed = time.perf_counter() - start
+    print(f"Done: {processed} images ({failed} failed) in {elapsed:.1f}s, "
+          f"{processed / elapsed if elapsed else 0:.1f} images/sec", file=log)
+    if parquet:
+        write_parquet(checkpoint, output)
+    return processed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m skinsight.batch", description="Batch color season analysis.")
+    parser.add_argument("source", help="directory, .tar(.gz) or .zip of photos")
+    parser.add_argument("-o", "--output", required=True, help=".jsonl or .parquet results file")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--progress-every", type=float, default=10.0, help="seconds between throughput reports")
+    parser.add_argument("--all-faces", action="store_true", help="analyse every face, not just the largest")
+    args = parser.parse_args(argv)
+    run(args.source, args.output, args.workers, args.progress_every, args.all_faces)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Content-addressed cache for analysis results.
+
+Results are keyed by the SHA-256 digest of the uploaded bytes plus the
+pipeline version, so widget-driven Streamlit reruns on the same photo skip
+detection, landmarking and clustering entirely.  Entries are evicted in LRU
+order once either the entry count or the memory budget is exceeded.  When a
+directory is configured, results are also written to disk and survive
+restarts.
+"""
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+MISS = object()
+
+
+def content_key(data, version):
+    return f"{hashlib.sha256(data).hexdigest()}-v{version}"
+
+
+def read_bytes(source):
+    """Return the raw bytes of an upload, path or file-like object."""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return f.read()
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+    position = source.tell()
+    data = source.read()
+    source.seek(position)
+    return data
+
+
+class ResultCache:
+    """Thread-safe LRU cache with an optional on-disk store."""
+
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024, disk_dir=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, key + ".pkl")
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return self._entries[key][0]
+        if self.disk_dir:
+            try:
+                with open(self._disk_path(key), "rb") as f:
+                    payload = f.read()
+            except FileNotFoundError:
+                pass
+            else:
+                value = pickle.loads(payload)
+                self._store(key, value, len(payload))
+                with self._lock:
+                    self._stats["disk_hits"] += 1
+                return value
+        with self._lock:
+            self._stats["misses"] += 1
+        return MISS
+
+    def put(self, key, value):
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self._store(key, value, len(payload))
+        if self.disk_dir:
+            # Write-then-rename so a crash never leaves a truncated entry behind
+            tmp_path = f"{self._disk_path(key)}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, self._disk_path(key))
+
+    def _store(self, key, value, size):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._stats["evictions"] += 1
+
+    def get_or_compute(self, data, version, compute):
+        """Return the cached result for ``data`` or compute and store it."""
+        key = content_key(data, version)
+        value = self.get(key)
+        if value is MISS:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries), bytes=self._bytes)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache():
+    """Process-wide cache configured from ``SKINSIGHT_CACHE_*`` variables."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResultCache(
+                    max_entries=int(os.environ.get("SKINSIGHT_CACHE_MAX_ENTRIES", 256)),
+                    max_bytes=int(os.environ.get("SKINSIGHT_CACHE_MAX_MB", 64)) * 1024 * 1024,
+                    disk_dir=os.environ.get("SKINSIGHT_CACHE_DIR") or None,
+                )
+    return _cache
@@ -0,0 +1,190 @@
+"""Score a product catalogue against every season and build a lookup index.
+
+    python -m skinsight.catalogue products.csv -o index.json
+    python -m skinsight.catalogue products.parquet -o index.json --image-column image --image-root media/
+    python -m skinsight.catalogue products.csv -o index.json --tags tags.csv
+
+Rows are streamed in chunks from CSV or Parquet (needs ``pyarrow``).  Each
+product's colour is its hex column or, when that is empty, the dominant
+colour of its product image.  A chunk is scored against every season in one
+:class:`~skinsight.palette.PaletteIndex` call, and only each season's best
+``--top`` SKUs are kept, so memory stays flat however many rows there are.
+``--tags`` additionally streams every SKU's suitable seasons to a CSV.
+"""
+import argparse
+import csv
+import heapq
+import itertools
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from skinsight.palette import load_palette_index
+
+CHUNK_ROWS = 50000
+IMAGE_MAX_SIDE = 256   # product photos are decoded this small; colour does not need detail
+BACKGROUND_MIN = 235   # pixels this bright in every channel count as studio background
+_HEX = re.compile(r"^#?[0-9A-Fa-f]{6}$")
+
+
+def iter_chunks(path, columns, chunk_rows=CHUNK_ROWS):
+    """Yield lists of row dicts, ``chunk_rows`` at a time, from a CSV or Parquet file."""
+    if path.endswith(".parquet"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet input requires pyarrow (pip install pyarrow)") from None
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=columns):
+            yield batch.to_pylist()
+    else:
+        with open(path, newline="") as f:
+            reader = csv.DictReader(f)
+            while True:
+                chunk = list(itertools.islice(reader, chunk_rows))
+                if not chunk:
+                    return
+                yield chunk
+
+
+def image_color(path):
+    """The dominant non-background colour of a product image as ``"#RRGGBB"``, or None."""
+    from skinsight.clustering import dominant_colors
+    from skinsight.decode import decode_image
+
+    try:
+        pixels = decode_image(path, max_side=IMAGE_MAX_SIDE).reshape(-1, 3)
+    except Exception:
+        return None
+    pixels = pixels[(pixels < BACKGROUND_MIN).any(axis=1)]
+    if len(pixels) == 0:
+        return None
+    centers, _ = dominant_colors(pixels, k=3, engine="subsample")
+    blue, green, red = centers[0]
+    return f"#{red:02X}{green:02X}{blue:02X}"
+
+
+class SeasonTopK:
+    """The ``k`` best-scoring SKUs per season, kept as bounded min-heaps."""
+
+    def __init__(self, seasons, k, min_score=0.0):
+        self.seasons = seasons
+        self.k = k
+        self.min_score = min_score
+        self.heaps = [[] for _ in seasons]
+
+    def update(self, skus, scores):
+        """Merge one chunk: ``skus`` of length n and an ``(n, seasons)`` score array."""
+        for column, heap in enumerate(self.heaps):
+            values = scores[:, column]
+            floor = heap[0][0] if len(heap) == self.k else self.min_score
+            candidates = np.flatnonzero(values > floor)
+            if len(candidates) > self.k:
+                # Only a chunk's own top k can possibly enter the heap
+                candidates = candidates[np.argpartition(values[candidates], -self.k)[-self.k:]]
+            for row in candidates:
+                item = (float(values[row]), skus[row])
+                if len(heap) < self.k:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+
+    def as_dict(self):
+        return {
+            season: [[sku, round(score, 4)] for score, sku in sorted(heap, reverse=True)]
+            for season, heap in zip(self.seasons, self.heaps)
+        }
+
+
+def _chunk_colors(rows, hex_column, image_column, image_root, pool):
+    """Hex codes for a chunk (None where unusable), from the hex column or else the product image."""
+    codes = [str(row.get(hex_column) or "").strip() if hex_column else "" for row in rows]
+    missing = [i for i, code in enumerate(codes) if not code and image_column and rows[i].get(image_column)]
+    if missing:
+        paths = [os.path.join(image_root, str(rows[i][image_column]).strip()) for i in missing]
+        found = pool.map(image_color, paths, chunksize=16) if pool else map(image_color, paths)
+        for i, code in zip(missing, found):
+            codes[i] = code or ""
+    return ["#" + code.lstrip("#").upper() if _HEX.match(code) else None for code in codes]
+
+
+def run(source, output, id_column="sku", hex_column="color_hex", image_column=None, image_root="",
+        top=500, min_score=0.0, tags=None, tag_threshold=0.5, workers=1, chunk_rows=CHUNK_ROWS,
+        log=sys.stderr):
+    index = load_palette_index()
+    best = SeasonTopK(index.seasons, top, min_score)
+    columns = [c for c in (id_column, hex_column, image_column) if c]
+    rows_seen = scored = 0
+    start = time.perf_counter()
+
+    pool = ProcessPoolExecutor(max_workers=workers) if image_column and workers > 1 else None
+    tag_file = open(tags, "w", newline="") if tags else None
+    try:
+        tag_writer = csv.writer(tag_file) if tag_file else None
+        if tag_writer:
+            tag_writer.writerow([id_column, "color_hex", "seasons"])
+        for rows in iter_chunks(source, columns, chunk_rows):
+            rows_seen += len(rows)
+            codes = _chunk_colors(rows, hex_column, image_column, image_root, pool)
+            keep = [i for i, code in enumerate(codes) if code]
+            if not keep:
+                continue
+            skus = [str(rows[i][id_column]) for i in keep]
+            hexes = [codes[i] for i in keep]
+            scores = index.score(hexes)
+            best.update(skus, scores)
+            scored += len(keep)
+            if tag_writer:
+                suitable = scores >= tag_threshold
+                tag_writer.writerows(
+                    (sku, code, ";".join(s for s, ok in zip(index.seasons, flags) if ok))
+                    for sku, code, flags in zip(skus, hexes, suitable)
+                )
+            elapsed = time.perf_counter() - start
+            print(f"{rows_seen} rows, {scored} scored, {rows_seen / elapsed:,.0f} rows/sec", file=log)
+    finally:
+        if pool:
+            pool.shutdown()
+        if tag_file:
+            tag_file.close()
+
+    result = {
+        "palette_entries": len(index),
+        "rows": rows_seen,
+        "scored": scored,
+        "top": top,
+        "seasons": best.as_dict(),
+    }
+    with open(output, "w") as f:
+        json.dump(result, f)
+    print(f"Done: {scored}/{rows_seen} rows scored in {time.perf_counter() - start:.1f}s", file=log)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m skinsight.catalogue",
+                                     description="Score a product catalogue against every season.")
+    parser.add_argument("source", help=".csv or .parquet product catalogue")
+    parser.add_argument("-o", "--output", required=True, help="season -> SKU index (.json)")
+    parser.add_argument("--id-column", default="sku")
+    parser.add_argument("--hex-column", default="color_hex", help='"#RRGGBB" colour column ("" for none)')
+    parser.add_argument("--image-column", help="product image path column, used when the hex is empty")
+    parser.add_argument("--image-root", default="", help="directory image paths are relative to")
+    parser.add_argument("--top", type=int, default=500, help="SKUs kept per season")
+    parser.add_argument("--min-score", type=float, default=0.0, help="lowest score worth indexing")
+    parser.add_argument("--tags", help="also write every SKU's suitable seasons to this CSV")
+    parser.add_argument("--tag-threshold", type=float, default=0.5, help="score at which a season is tagged")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="processes for image colour extraction")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args(argv)
+    run(args.source, args.output, args.id_column, args.hex_column or None, args.image_column,
+        args.image_root, args.top, args.min_score, args.tags, args.tag_threshold, args.workers,
+        args.chunk_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Nearest-centroid season classifier driven by a versioned table.
+
+The table (``data/season_centroids.json`` unless ``SKINSIGHT_CLASSIFIER_TABLE``
+points elsewhere) lists the feature names it uses, a per-feature scale and
+one centroid per season.  Features are divided by the scale once, and scoring
+is a single vectorised squared-distance computation, so any number of faces
+can be scored together.  Per-season scores are a softmax over negative
+distances at the table's ``temperature``.  The temperature has not been
+fitted to labelled photos, so the scores rank the seasons and show how
+close a call is, but they are not calibrated probabilities.
+
+Every season in the table must exist in the knowledge base; this is checked
+when the table is loaded, so a bad table fails at start-up instead of in the UI.
+"""
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from skinsight.features import FEATURE_NAMES
+from skinsight.knowledge import load_knowledge_base
+
+TABLE_PATH = os.environ.get(
+    "SKINSIGHT_CLASSIFIER_TABLE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "season_centroids.json"),
+)
+# Features available to a table besides the skin features
+EXTRA_FEATURES = ("contrast",)
+
+
+class SeasonClassifier:
+    def __init__(self, table):
+        validate_table(table)
+        self.version = table["version"]
+        self.features = tuple(table["features"])
+        self.seasons = tuple(table["centroids"])
+        self.scale = np.asarray(table["scale"], dtype=float)
+        self.defaults = dict(table.get("defaults", {}))
+        self.temperature = float(table.get("temperature", 1.0))
+        self.centroids = np.asarray([table["centroids"][s] for s in self.seasons]) / self.scale
+
+    def vectorize(self, features, contrast=None):
+        """Build this table's feature vector from a face's feature dict and contrast score."""
+        values = dict(features, contrast=contrast)
+        return np.array([
+            values[name] if values.get(name) is not None else self.defaults[name]
+            for name in self.features
+        ], dtype=float)
+
+    def score(self, X):
+        """Return an ``(n, seasons)`` array of scores summing to 1 per row."""
+        X = np.atleast_2d(X) / self.scale
+        distances = (
+            (X ** 2).sum(axis=1)[:, None]
+            - 2 * X @ self.centroids.T
+            + (self.centroids ** 2).sum(axis=1)[None, :]
+        )
+        logits = -np.maximum(distances, 0) / (2 * self.temperature)
+        logits -= logits.max(axis=1, keepdims=True)
+        weights = np.exp(logits)
+        return weights / weights.sum(axis=1, keepdims=True)
+
+    def classify(self, x):
+        """Return ``(season, {season: score})`` for a single feature vector."""
+        scores = self.score(x)[0]
+        return self.seasons[int(scores.argmax())], dict(zip(self.seasons, scores.round(4).tolist()))
+
+
+def validate_table(table):
+    for key in ("version", "features", "scale", "centroids"):
+        if key not in table:
+            raise ValueError(f"Classifier table is missing {key!r}")
+    known = set(FEATURE_NAMES) | set(EXTRA_FEATURES)
+    unknown = [name for name in table["features"] if name not in known]
+    if unknown:
+        raise ValueError(f"Classifier table uses unknown features: {unknown}")
+    if len(table["scale"]) != len(table["features"]) or min(table["scale"]) <= 0:
+        raise ValueError("Classifier table needs one positive scale per feature")
+    missing_defaults = [
+        name for name in EXTRA_FEATURES
+        if name in table["features"] and name not in table.get("defaults", {})
+    ]
+    if missing_defaults:
+        raise ValueError(f"Classifier table needs defaults for optional features: {missing_defaults}")
+    seasons = load_knowledge_base().seasons
+    undefined = [season for season in table["centroids"] if season not in seasons]
+    if undefined:
+        raise ValueError(f"Classifier table has seasons missing from the knowledge base: {undefined}")
+    for season, centroid in table["centroids"].items():
+        if len(centroid) != len(table["features"]):
+            raise ValueError(f"Centroid for {season!r} has {len(centroid)} values, expected {len(table['features'])}")
+
+
+@lru_cache(maxsize=None)
+def load_classifier(path=TABLE_PATH):
+    with open(path) as f:
+        return SeasonClassifier(json.load(f))
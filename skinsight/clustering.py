@@ -0,0 +1,142 @@
+"""Dominant-colour engines for skin pixels.
+
+Every engine takes an ``(N, 3)`` pixel array and returns ``(centers,
+weights)``; :func:`dominant_colors` sorts them so index 0 is always the
+largest cluster.  All engines are seeded, so the same pixels always give the
+same answer.
+
+* ``kmeans``     - full KMeans over every pixel (the original behaviour)
+* ``subsample``  - KMeans over a random or stratified sample of ``budget`` pixels
+* ``minibatch``  - MiniBatchKMeans over every pixel
+* ``histogram``  - modes of a 3-D colour histogram, no iterative fitting
+"""
+import os
+
+import numpy as np
+
+DEFAULT_ENGINE = os.environ.get("SKINSIGHT_CLUSTER_ENGINE", "subsample")
+SAMPLE_BUDGET = 4000
+SEED = 0
+# HSV histogram resolution (OpenCV hue spans 0-179, saturation/value 0-255)
+HIST_BINS = (18, 8, 8)
+HIST_RANGES = (180, 256, 256)
+
+ENGINES = {}
+
+
+def register_engine(name):
+    def decorator(fn):
+        ENGINES[name] = fn
+        return fn
+    return decorator
+
+
+def subsample(pixels, budget=SAMPLE_BUDGET, strategy="random", seed=SEED):
+    """Deterministically reduce ``pixels`` to at most ``budget`` rows.
+
+    ``stratified`` takes evenly strided rows from a random offset; because
+    mask pixels come out in raster order this spreads the sample over the
+    whole face region.
+    """
+    n = len(pixels)
+    if n <= budget:
+        return pixels
+    rng = np.random.default_rng(seed)
+    if strategy == "stratified":
+        step = n / budget
+        index = (rng.random() * step + np.arange(budget) * step).astype(np.intp)
+    elif strategy == "random":
+        index = np.sort(rng.choice(n, size=budget, replace=False))
+    else:
+        raise ValueError(f"Unknown sampling strategy: {strategy!r}")
+    return pixels[index]
+
+
+def _weights(labels, k):
+    return np.bincount(labels, minlength=k) / len(labels)
+
+
+@register_engine("kmeans")
+def _kmeans(pixels, k, seed=SEED, **_):
+    from sklearn.cluster import KMeans
+
+    clt = KMeans(n_clusters=k, random_state=seed).fit(pixels)
+    return clt.cluster_centers_, _weights(clt.labels_, k)
+
+
+@register_engine("subsample")
+def _subsample_kmeans(pixels, k, budget=SAMPLE_BUDGET, strategy="random", seed=SEED, **_):
+    return _kmeans(subsample(pixels, budget, strategy, seed), k, seed=seed)
+
+
+@register_engine("minibatch")
+def _minibatch_kmeans(pixels, k, seed=SEED, batch_size=2048, **_):
+    from sklearn.cluster import MiniBatchKMeans
+
+    clt = MiniBatchKMeans(n_clusters=k, random_state=seed, batch_size=batch_size, n_init=3)
+    clt.fit(pixels)
+    return clt.cluster_centers_, _weights(clt.labels_, k)
+
+
+@register_engine("histogram")
+def _histogram_modes(pixels, k, bins=HIST_BINS, ranges=HIST_RANGES, **_):
+    bins = np.asarray(bins)
+    coords = pixels.astype(np.intp) * bins // np.asarray(ranges)
+    np.minimum(coords, bins - 1, out=coords)
+    flat = np.ravel_multi_index(coords.T, bins)
+
+    counts = np.bincount(flat, minlength=bins.prod())
+    occupied = np.flatnonzero(counts)
+    bin_counts = counts[occupied]
+    bin_means = np.stack([
+        np.bincount(flat, weights=pixels[:, c], minlength=bins.prod())[occupied]
+        for c in range(3)
+    ], axis=1) / bin_counts[:, None]
+
+    # Greedy peak picking: take the fullest bins, skipping neighbours of
+    # peaks already chosen (hue is circular)
+    bin_coords = np.stack(np.unravel_index(occupied, bins), axis=1)
+    peaks = []
+    for i in np.argsort(-bin_counts, kind="stable"):
+        if len(peaks) == k:
+            break
+        delta = np.abs(bin_coords[peaks] - bin_coords[i])
+        delta[:, 0] = np.minimum(delta[:, 0], bins[0] - delta[:, 0])
+        if not peaks or (delta.max(axis=1) > 1).all():
+            peaks.append(i)
+    # Too few separated peaks: fall back to the fullest remaining bins
+    for i in np.argsort(-bin_counts, kind="stable"):
+        if len(peaks) == k:
+            break
+        if i not in peaks:
+            peaks.append(i)
+
+    # One assignment step over bin means refines the peaks into cluster centres
+    distances = ((bin_means[:, None, :] - bin_means[peaks][None, :, :]) ** 2).sum(axis=2)
+    labels = distances.argmin(axis=1)
+    weights = np.bincount(labels, weights=bin_counts, minlength=len(peaks))
+    centers = np.stack([
+        np.bincount(labels, weights=bin_means[:, c] * bin_counts, minlength=len(peaks))
+        for c in range(3)
+    ], axis=1) / weights[:, None]
+    if len(peaks) < k:
+        # Fewer occupied bins than k: repeat the fullest centre with zero weight
+        missing = k - len(peaks)
+        centers = np.concatenate([centers, np.repeat(centers[:1], missing, axis=0)])
+        weights = np.concatenate([weights, np.zeros(missing)])
+    return centers, weights / len(pixels)
+
+
+def dominant_colors(pixels, k=3, engine=DEFAULT_ENGINE, **options):
+    """Return ``(centers, weights)`` with ``centers`` as ints, largest cluster first.
+
+    Every engine returns exactly ``k`` rows.  When the pixels hold fewer
+    than ``k`` distinct colours, the extra rows have zero weight.
+    """
+    try:
+        fn = ENGINES[engine]
+    except KeyError:
+        raise ValueError(f"Unknown clustering engine: {engine!r}") from None
+    centers, weights = fn(pixels, k, **options)
+    order = np.argsort(-weights, kind="stable")
+    return centers[order].astype(int), weights[order]
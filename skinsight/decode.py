@@ -0,0 +1,46 @@
+"""Image decoding for the pipeline.
+
+JPEGs are decoded with libjpeg's DCT scaling (``Image.draft``), which
+produces a 1/2, 1/4 or 1/8 size image directly instead of decoding every
+pixel of a phone photo and shrinking it afterwards.  EXIF orientation is
+applied, and every input mode (RGBA, palette, greyscale, CMYK, ...) ends up
+as one contiguous BGR buffer.
+"""
+import os
+
+import numpy as np
+
+DECODE_MAX_SIDE = int(os.environ.get("SKINSIGHT_DECODE_MAX_SIDE", 2048))
+
+
+def open_image(source, max_side=DECODE_MAX_SIDE):
+    """Open ``source`` as an upright RGB PIL image no larger than ``max_side``."""
+    from PIL import Image, ImageOps
+
+    image = Image.open(source)
+    if max_side and max(image.size) > max_side:
+        scale = max_side / max(image.size)
+        # Only picks a DCT scale that still yields at least the requested size
+        image.draft("RGB", (int(image.size[0] * scale), int(image.size[1] * scale)))
+    ImageOps.exif_transpose(image, in_place=True)
+    if image.mode != "RGB":
+        if image.mode in ("RGBA", "LA") or "transparency" in image.info:
+            # Flatten transparent areas onto white rather than dropping alpha to black
+            image = image.convert("RGBA")
+            background = Image.new("RGBA", image.size, (255, 255, 255, 255))
+            image = Image.alpha_composite(background, image)
+        image = image.convert("RGB")
+    if max_side and max(image.size) > max_side:
+        image.thumbnail((max_side, max_side), Image.Resampling.BILINEAR, reducing_gap=2.0)
+    return image
+
+
+def decode_image(source, max_side=DECODE_MAX_SIDE):
+    """Decode ``source`` to an ``(H, W, 3)`` uint8 BGR array.
+
+    Pillow packs the pixels straight into BGR order and the array wraps that
+    buffer without copying, so the result is read-only.
+    """
+    image = open_image(source, max_side)
+    width, height = image.size
+    return np.frombuffer(image.tobytes("raw", "BGR"), dtype=np.uint8).reshape(height, width, 3)
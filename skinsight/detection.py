@@ -0,0 +1,81 @@
+"""Downscaled face detection and ROI-cropped landmarking.
+
+HOG detection cost grows with the pixel count, so phone photos (12-48 MP)
+are detected on a pyramid level whose longest side is bounded by
+``max_side``.  Face boxes are mapped back to full resolution and the shape
+predictor only ever sees the region around the faces.
+
+dlib's HOG detector scans an 80 x 80 px window, so the smallest face it
+finds is about ``80 * longest_side / max_side / 2 ** upsample`` px wide in
+the original: roughly 200 px in a 2048 px decode at the defaults.  Group
+photos (``upsample=GROUP_UPSAMPLE``) go down to roughly 100 px, at about
+four times the detection cost.
+"""
+import os
+
+import numpy as np
+
+DETECT_MAX_SIDE = int(os.environ.get("SKINSIGHT_DETECT_MAX_SIDE", 800))
+GROUP_UPSAMPLE = 1  # extra detector pyramid levels when every face is wanted
+ROI_MARGIN = 0.3
+
+
+def detect_faces(image, detector, max_side=DETECT_MAX_SIDE, upsample=0):
+    """Return face boxes ``(left, top, right, bottom)`` in full-resolution pixels.
+
+    ``image`` is BGR.  Boxes are ordered largest first.  Pass ``max_side=0``
+    to detect at native resolution; ``upsample`` doubles the detection
+    resolution that many times, to find smaller faces.
+    """
+    import cv2
+
+    h, w = image.shape[:2]
+    scale = 1.0
+    if max_side and max(h, w) > max_side:
+        scale = max_side / max(h, w)
+        image = cv2.resize(
+            image, (max(1, round(w * scale)), max(1, round(h * scale))),
+            interpolation=cv2.INTER_AREA,
+        )
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    boxes = []
+    for rect in detector(gray, upsample):
+        boxes.append((
+            max(0, int(rect.left() / scale)),
+            max(0, int(rect.top() / scale)),
+            min(w, int(round(rect.right() / scale))),
+            min(h, int(round(rect.bottom() / scale))),
+        ))
+    boxes.sort(key=lambda b: (b[2] - b[0]) * (b[3] - b[1]), reverse=True)
+    return boxes
+
+
+def face_roi(box, shape, margin=ROI_MARGIN):
+    """Expand a face box by ``margin`` of its size, clipped to the image."""
+    left, top, right, bottom = box
+    h, w = shape[:2]
+    mx = int((right - left) * margin)
+    my = int((bottom - top) * margin)
+    return max(0, left - mx), max(0, top - my), min(w, right + mx), min(h, bottom + my)
+
+
+def landmark_points(predictor, image, boxes):
+    """Run the 68-point predictor for every box.
+
+    The greyscale conversion covers only the union of the face ROIs and is
+    shared by all faces.  Returns one ``(68, 2)`` int32 array per box, in
+    full-image coordinates.
+    """
+    import cv2
+    import dlib
+
+    rois = np.array([face_roi(box, image.shape) for box in boxes])
+    x0, y0 = rois[:, :2].min(axis=0)
+    x1, y1 = rois[:, 2:].max(axis=0)
+    gray = cv2.cvtColor(image[y0:y1, x0:x1], cv2.COLOR_BGR2GRAY)
+    landmarks = []
+    for left, top, right, bottom in boxes:
+        shape = predictor(gray, dlib.rectangle(left - x0, top - y0, right - x0, bottom - y0))
+        points = np.array([(p.x, p.y) for p in shape.parts()], dtype=np.int32)
+        landmarks.append(points + (x0, y0))
+    return landmarks
@@ -0,0 +1,54 @@
+"""Pixel sampling inside landmark polygons.
+
+Only the bounding box of the polygon is masked, and only the selected pixels
+are colour-converted, so the cost scales with the face rather than the
+photo.
+"""
+import numpy as np
+
+
+def polygon_pixels(image, points):
+    """Return the BGR pixels inside the convex polygon as an ``(N, 3)`` array."""
+    import cv2
+
+    x, y, w, h = cv2.boundingRect(points)
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + w, image.shape[1]), min(y + h, image.shape[0])
+    if x1 <= x0 or y1 <= y0:
+        return np.empty((0, 3), dtype=image.dtype)
+    mask = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+    cv2.fillConvexPoly(mask, points - (x0, y0), 255)
+    # Boolean indexing already yields a fresh contiguous (N, 3) array
+    return image[y0:y1, x0:x1][mask.view(bool)]
+
+
+def convert_pixels(pixels, code):
+    """Colour-convert an ``(N, 3)`` pixel list without touching the full frame."""
+    import cv2
+
+    if len(pixels) == 0:
+        return pixels
+    return cv2.cvtColor(pixels.reshape(-1, 1, 3), code).reshape(-1, 3)
+
+
+def skin_pixels_hsv(image, points):
+    """HSV skin pixels inside the landmark polygon, as a contiguous ``(N, 3)`` array."""
+    import cv2
+
+    return convert_pixels(polygon_pixels(image, points), cv2.COLOR_BGR2HSV)
+
+
+def polygons_pixels(image, polygons, code=None):
+    """Sample several polygons, colour-converting them (if ``code`` is given) in a single call.
+
+    Returns one contiguous ``(N_i, 3)`` array per polygon.
+    """
+    samples = [polygon_pixels(image, points) for points in polygons]
+    if code is None:
+        return samples
+    return split_like(convert_pixels(np.concatenate(samples), code), samples)
+
+
+def split_like(array, samples):
+    """Split a concatenated per-polygon array back into ``samples``' lengths."""
+    return np.split(array, np.cumsum([len(s) for s in samples])[:-1])
@@ -0,0 +1,66 @@
+"""Perceptual colour features of skin pixels.
+
+OpenCV's HSV hue wraps at 180 right in the red range where skin sits, so
+averaging it is unstable.  CIELAB has no wrap: the mean a*/b* give a stable
+chroma and hue angle, and the Individual Typology Angle (ITA, the
+dermatological lightness/tan measure) follows from L* and b*.  Everything
+here is one vectorised pass over the pixels, no iterative fitting.
+"""
+import numpy as np
+
+FEATURE_NAMES = ("L", "a", "b", "chroma", "hue_angle", "ita", "L_std", "L_p10", "L_p90")
+
+# sRGB (D65) -> XYZ, rows pre-divided by the reference white
+_SRGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+]) / np.array([[0.95047], [1.0], [1.08883]])
+
+# uint8 sRGB -> linear light, so linearising is a table lookup
+_LINEAR = np.arange(256) / 255
+_LINEAR = np.where(_LINEAR <= 0.04045, _LINEAR / 12.92, ((_LINEAR + 0.055) / 1.055) ** 2.4)
+
+
+def rgb_to_lab(rgb):
+    """Convert an ``(N, 3)`` uint8 RGB array to float CIELAB (L* 0-100)."""
+    xyz = _LINEAR[rgb] @ _SRGB_TO_XYZ.T
+    delta = 6 / 29
+    f = np.where(xyz > delta ** 3, np.cbrt(xyz), xyz / (3 * delta ** 2) + 4 / 29)
+    return np.stack([
+        116 * f[:, 1] - 16,
+        500 * (f[:, 0] - f[:, 1]),
+        200 * (f[:, 1] - f[:, 2]),
+    ], axis=1)
+
+
+def bgr_to_lab(pixels):
+    """Convert an ``(N, 3)`` uint8 BGR pixel array to float CIELAB."""
+    return rgb_to_lab(pixels[:, ::-1])
+
+
+def hex_to_lab(hex_codes):
+    """Convert ``"#RRGGBB"`` strings to an ``(N, 3)`` CIELAB array."""
+    packed = np.array([int(code.lstrip("#"), 16) for code in hex_codes], dtype=np.uint32)
+    rgb = (packed[:, None] >> np.array([16, 8, 0], dtype=np.uint32)) & 0xFF
+    return rgb_to_lab(rgb.astype(np.uint8))
+
+
+def lab_features(L, a, b, L_std, L_p10, L_p90):
+    """Assemble the feature vector from summary statistics of the Lab pixels."""
+    return np.array([
+        L, a, b,
+        np.hypot(a, b),
+        np.degrees(np.arctan2(b, a)),
+        # ITA = arctan((L* - 50) / b*); arctan2 stays finite as b* -> 0
+        np.degrees(np.arctan2(L - 50, b)),
+        L_std, L_p10, L_p90,
+    ])
+
+
+def skin_features(lab):
+    """Feature vector (see ``FEATURE_NAMES``) for ``(N, 3)`` Lab skin pixels."""
+    L = lab[:, 0]
+    a, b = lab[:, 1].mean(), lab[:, 2].mean()
+    p10, p90 = np.percentile(L, (10, 90))
+    return lab_features(L.mean(), a, b, L.std(), p10, p90)
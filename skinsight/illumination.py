@@ -0,0 +1,102 @@
+"""White-balance correction of the sampled face pixels.
+
+The same face under tungsten and daylight gives different hue angles and
+so different seasons.  A per-channel (von Kries) gain in linear light
+removes most of the cast.  The gains are estimated from a reference that
+should be neutral:
+
+* ``sclera``      - the brightest quarter of each eye opening, from the landmarks;
+  falls back to no correction when too few eye-white pixels are visible or
+  they are not clearly brighter than the skin (closed eyes, glasses glare, shadow)
+* ``gray_world``  - the mean of the whole (subsampled) photo
+* ``white_patch`` - the brightest non-clipped pixels of the photo
+* ``none``        - no correction
+
+The mode comes from ``SKINSIGHT_ILLUMINATION`` or the ``mode`` argument.
+Only the sampled region pixels are corrected, through a 3 x 256 lookup
+table, so the cost is independent of the photo size.
+"""
+import os
+
+import numpy as np
+
+from skinsight.features import _LINEAR
+
+ILLUMINATION_MODE = os.environ.get("SKINSIGHT_ILLUMINATION", "sclera")
+MODES = ("none", "gray_world", "white_patch", "sclera")
+MAX_GAIN = 1.6          # gains are clamped to [1 / MAX_GAIN, MAX_GAIN]
+MIN_SCLERA_PIXELS = 20
+SCLERA_SHARE = 0.25    # brightest share of the eye opening taken as sclera
+SCLERA_MIN_RATIO = 1.25  # sclera must be this much brighter than the skin, in linear light
+CLIPPED = 250           # pixels at or above this in any channel are not used as references
+IMAGE_STRIDE = 4        # gray_world/white_patch look at every 4th row and column
+WHITE_PATCH_SHARE = 0.01
+
+# linear light (4096 levels) -> uint8 sRGB
+_LEVELS = np.linspace(0, 1, 4096)
+_ENCODE = np.round(255 * np.where(
+    _LEVELS <= 0.0031308, _LEVELS * 12.92, 1.055 * _LEVELS ** (1 / 2.4) - 0.055
+)).astype(np.uint8)
+
+
+def _unclipped(pixels):
+    return pixels[(pixels < CLIPPED).all(axis=1)]
+
+
+def _balance(reference):
+    """Gains that map the mean linear colour of ``reference`` BGR pixels to grey."""
+    if len(reference) == 0:
+        return np.ones(3)
+    means = _LINEAR[reference].mean(axis=0)
+    if (means <= 0).any():
+        return np.ones(3)
+    gains = means.mean() / means
+    return np.clip(gains, 1 / MAX_GAIN, MAX_GAIN)
+
+
+def sclera_pixels(eye_bgr):
+    """The eye-white pixels of an eye opening: its brightest, unclipped quarter.
+
+    The opening also holds iris, pupil and (with loose landmarks) lid skin,
+    all darker than the sclera.
+    """
+    if len(eye_bgr) == 0:
+        return eye_bgr
+    brightness = eye_bgr.sum(axis=1, dtype=np.int32)
+    return _unclipped(eye_bgr[brightness >= np.percentile(brightness, 100 - 100 * SCLERA_SHARE)])
+
+
+def estimate_gains(mode, image=None, eye_bgr=None, skin_bgr=None):
+    """BGR gains for ``mode``; ``image`` or the eye pixels supply the reference."""
+    if mode not in MODES:
+        raise ValueError(f"unknown illumination mode {mode!r}; expected one of {', '.join(MODES)}")
+    if mode == "sclera":
+        reference = sclera_pixels(eye_bgr)
+        if len(reference) < MIN_SCLERA_PIXELS:
+            return np.ones(3)
+        if skin_bgr is not None and len(skin_bgr) and \
+                _LINEAR[reference].mean() < SCLERA_MIN_RATIO * _LINEAR[skin_bgr[::IMAGE_STRIDE]].mean():
+            return np.ones(3)
+        return _balance(reference)
+    if mode == "none":
+        return np.ones(3)
+    pixels = _unclipped(image[::IMAGE_STRIDE, ::IMAGE_STRIDE].reshape(-1, 3))
+    if mode == "white_patch" and len(pixels):
+        brightness = pixels.sum(axis=1, dtype=np.int32)
+        count = max(1, int(len(pixels) * WHITE_PATCH_SHARE))
+        pixels = pixels[np.argpartition(brightness, -count)[-count:]]
+    return _balance(pixels)
+
+
+def correction_table(gains):
+    """A ``(3, 256)`` uint8 lookup table applying linear-light ``gains``."""
+    linear = np.clip(_LINEAR[None, :] * np.asarray(gains)[:, None], 0, 1)
+    return _ENCODE[np.round(linear * 4095).astype(np.intp)]
+
+
+def apply_gains(pixels, gains):
+    """Correct an ``(N, 3)`` uint8 BGR array with per-channel ``gains``."""
+    if np.allclose(gains, 1):
+        return pixels
+    table = correction_table(gains)
+    return table[np.arange(3), pixels]
@@ -0,0 +1,244 @@
+"""The season knowledge base, compiled into validated, indexed records.
+
+``data/seasons.json`` (or the file named by ``SKINSIGHT_KNOWLEDGE_BASE``)
+holds the raw season data.  :func:`load_knowledge_base` reads it once per
+process and compiles it into frozen, slotted records.  Paired lists (names,
+hex codes and reasons) become single items, so they cannot drift apart;
+avoid entries get their representative colour from ``avoid_swatches``.
+The result also has per-gender views and indexes by colour, metal and
+occasion.  Validation runs during the build and reports every problem at
+once; ``python -m skinsight.knowledge`` runs it on its own, e.g. at deploy
+time.
+
+``SEASONS`` and ``OCCASION_TYPES`` stay available as the raw, JSON-shaped
+dicts (e.g. for API payloads) and are loaded just as lazily.
+"""
+import json
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Tuple
+
+KB_PATH = os.environ.get(
+    "SKINSIGHT_KNOWLEDGE_BASE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "seasons.json"),
+)
+GENDERS = ("female", "male")
+# Occasion looks end with makeup for women and grooming for men
+FINISHING_KEYS = {"female": "makeup", "male": "grooming"}
+LOOK_KEYS = ("outfit", "shoes", "accessories")
+
+# Canonical metal for each spelling used in jewelry names, longest match first
+METALS = {
+    "white gold": "White Gold",
+    "rose gold": "Rose Gold",
+    "yellow gold": "Gold",
+    "gold": "Gold",
+    "oxidized silver": "Silver",
+    "sterling silver": "Silver",
+    "silver": "Silver",
+    "platinum": "Platinum",
+    "rhodium": "Rhodium",
+    "gunmetal": "Gunmetal",
+    "copper": "Copper",
+    "brass": "Brass",
+}
+_HEX = re.compile(r"^#[0-9A-Fa-f]{6}$")
+
+
+@dataclass(frozen=True, slots=True)
+class Item:
+    name: str
+    reason: str
+
+
+@dataclass(frozen=True, slots=True)
+class Swatch:
+    name: str
+    hex: str
+    reason: str
+
+
+@dataclass(frozen=True, slots=True)
+class Look:
+    outfit: str
+    shoes: str
+    accessories: str
+    finishing: str  # makeup (female) or grooming (male)
+
+
+@dataclass(frozen=True, slots=True)
+class GenderView:
+    gender: str
+    makeup: Tuple[Item, ...]
+    jewelry: Tuple[Item, ...]
+    occasions: Mapping[str, Look]
+
+    @property
+    def finishing_label(self):
+        return FINISHING_KEYS[self.gender].capitalize()
+
+
+@dataclass(frozen=True, slots=True)
+class Season:
+    name: str
+    description: str
+    colors: Tuple[Swatch, ...]
+    hair: Tuple[Item, ...]
+    avoid: Tuple[Swatch, ...]
+    metals: Tuple[str, ...]
+    female: GenderView
+    male: GenderView
+
+    def view(self, gender):
+        """Return the :class:`GenderView` for ``"female"``/``"male"`` (any case)."""
+        return self.female if gender.lower() == "female" else self.male
+
+
+@dataclass(frozen=True, slots=True)
+class OccasionProfile:
+    name: str
+    category: str
+    formality: int  # 1 (home/errands) to 5 (black tie)
+    evening: bool
+
+
+@dataclass(frozen=True, slots=True)
+class KnowledgeBase:
+    version: int
+    seasons: Mapping[str, Season]
+    occasion_types: Mapping[str, Tuple[str, ...]]
+    occasions: Mapping[str, OccasionProfile]
+    by_color: Mapping[str, Tuple[str, ...]]
+    by_metal: Mapping[str, Tuple[str, ...]]
+    by_occasion: Mapping[str, Tuple[str, ...]]
+
+
+def metal_of(item_name):
+    lowered = item_name.lower()
+    for spelling, metal in METALS.items():
+        if spelling in lowered:
+            return metal
+    return None
+
+
+def _paired(problems, where, raw, names_key, reasons_key, exact=True):
+    names, reasons = raw.get(names_key, []), raw.get(reasons_key, [])
+    # Male lists share the female reasons and may be shorter
+    if (len(names) != len(reasons)) if exact else (len(names) > len(reasons)):
+        problems.append(f"{where}: {len(names)} {names_key} but {len(reasons)} {reasons_key}")
+    return tuple(Item(name, reason) for name, reason in zip(names, reasons))
+
+
+def _index(pairs):
+    index = {}
+    for key, season in pairs:
+        if season not in index.setdefault(key, []):
+            index[key].append(season)
+    return MappingProxyType({key: tuple(seasons) for key, seasons in index.items()})
+
+
+def compile_knowledge_base(data):
+    """Validate raw knowledge-base data and compile it; raises ``ValueError``."""
+    problems = []
+    avoid_swatches = data.get("avoid_swatches", {})
+    problems += [f"avoid_swatches: bad hex code {code!r} for {name!r}"
+                 for name, code in avoid_swatches.items() if not _HEX.match(code)]
+    known_occasions = {o for occasions in data["occasion_types"].values() for o in occasions}
+    profiles = {}
+    for category, occasions in data["occasion_types"].items():
+        for occasion in occasions:
+            raw = data.get("occasion_profiles", {}).get(occasion)
+            if raw is None:
+                problems.append(f"occasion {occasion!r} has no occasion_profiles entry")
+            elif raw.get("formality") not in range(1, 6):
+                problems.append(f"occasion {occasion!r}: formality must be 1-5")
+            else:
+                profiles[occasion] = OccasionProfile(occasion, category, raw["formality"], bool(raw.get("evening")))
+    seasons = {}
+    for name, raw in data["seasons"].items():
+        missing = [key for key in ("description", "colors", "color_hex", "color_reasons", "hair", "hair_reasons",
+                                   "makeup", "makeup_male", "makeup_reasons", "jewelry", "jewelry_male",
+                                   "jewelry_reasons", "avoid", "avoid_reasons", "occasions") if key not in raw]
+        if missing:
+            problems.append(f"{name}: missing {', '.join(missing)}")
+            continue
+        if not len(raw["colors"]) == len(raw["color_hex"]) == len(raw["color_reasons"]):
+            problems.append(f"{name}: colors, color_hex and color_reasons differ in length")
+        problems += [f"{name}: bad hex code {code!r}" for code in raw["color_hex"] if not _HEX.match(code)]
+        problems += [f"{name}: avoid entry {item!r} has no avoid_swatches colour"
+                     for item in raw["avoid"] if item not in avoid_swatches]
+
+        views = {}
+        for gender in GENDERS:
+            suffix = "" if gender == "female" else "_male"
+            occasions = {}
+            for occasion, looks in raw["occasions"].items():
+                if occasion not in known_occasions:
+                    problems.append(f"{name}: occasion {occasion!r} is not in occasion_types")
+                look = looks.get(gender, {})
+                keys = (*LOOK_KEYS, FINISHING_KEYS[gender])
+                absent = [key for key in keys if key not in look]
+                if absent:
+                    problems.append(f"{name}/{occasion}/{gender}: missing {', '.join(absent)}")
+                    continue
+                occasions[occasion] = Look(*(look[key] for key in keys))
+            views[gender] = GenderView(
+                gender=gender,
+                makeup=_paired(problems, name, raw, "makeup" + suffix, "makeup_reasons", exact=not suffix),
+                jewelry=_paired(problems, name, raw, "jewelry" + suffix, "jewelry_reasons", exact=not suffix),
+                occasions=MappingProxyType(occasions),
+            )
+
+        jewelry_names = raw["jewelry"] + raw["jewelry_male"]
+        seasons[name] = Season(
+            name=name,
+            description=raw["description"],
+            colors=tuple(Swatch(*fields) for fields in zip(raw["colors"], raw["color_hex"], raw["color_reasons"])),
+            hair=_paired(problems, name, raw, "hair", "hair_reasons"),
+            avoid=tuple(
+                Swatch(item.name, avoid_swatches.get(item.name, ""), item.reason)
+                for item in _paired(problems, name, raw, "avoid", "avoid_reasons")
+            ),
+            metals=tuple(dict.fromkeys(m for m in map(metal_of, jewelry_names) if m)),
+            **views,
+        )
+    if problems:
+        raise ValueError("Invalid knowledge base:\n  " + "\n  ".join(problems))
+
+    return KnowledgeBase(
+        version=data.get("version", 1),
+        seasons=MappingProxyType(seasons),
+        occasion_types=MappingProxyType({k: tuple(v) for k, v in data["occasion_types"].items()}),
+        occasions=MappingProxyType(profiles),
+        by_color=_index((swatch.hex.upper(), s.name) for s in seasons.values() for swatch in s.colors),
+        by_metal=_index((metal, s.name) for s in seasons.values() for metal in s.metals),
+        by_occasion=_index((occasion, s.name) for s in seasons.values() for occasion in s.female.occasions),
+    )
+
+
+@lru_cache(maxsize=None)
+def load_raw(path=KB_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=None)
+def load_knowledge_base(path=KB_PATH):
+    return compile_knowledge_base(load_raw(path))
+
+
+def __getattr__(name):
+    if name == "SEASONS":
+        return load_raw()["seasons"]
+    if name == "OCCASION_TYPES":
+        return load_raw()["occasion_types"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+if __name__ == "__main__":
+    kb = load_knowledge_base()
+    print(f"Knowledge base v{kb.version} OK: {len(kb.seasons)} seasons, {len(kb.by_color)} colors, "
+          f"{len(kb.by_metal)} metals, {len(kb.by_occasion)} occasions with looks")
@@ -0,0 +1,110 @@
+"""Process-wide registry for the dlib face models.
+
+Streamlit re-executes the app script on every widget interaction, but
+imported modules stay cached in ``sys.modules``.  Keeping the detector and
+the 68-point shape predictor here means they are read from disk once per
+process instead of once per rerun.
+"""
+import os
+import threading
+import time
+
+PREDICTOR_PATH = os.environ.get(
+    "SKINSIGHT_PREDICTOR_PATH", "shape_predictor_68_face_landmarks.dat"
+)
+
+
+class ModelRegistry:
+    """Lazily loads and holds one detector/predictor pair, thread-safely."""
+
+    def __init__(self, predictor_path=PREDICTOR_PATH):
+        self.predictor_path = predictor_path
+        self._lock = threading.Lock()
+        self._detector = None
+        self._predictor = None
+        self._metrics = {"loads": 0, "hits": 0}
+
+    @property
+    def loaded(self):
+        return self._predictor is not None
+
+    def _load(self):
+        import dlib
+
+        with self._lock:
+            if self._predictor is not None:
+                return
+            start = time.perf_counter()
+            detector = dlib.get_frontal_face_detector()
+            detector_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            predictor = dlib.shape_predictor(self.predictor_path)
+            predictor_seconds = time.perf_counter() - start
+
+            self._detector = detector
+            self._predictor = predictor
+            self._metrics.update(
+                loads=self._metrics["loads"] + 1,
+                detector_load_seconds=detector_seconds,
+                predictor_load_seconds=predictor_seconds,
+                predictor_path=self.predictor_path,
+                predictor_bytes=os.path.getsize(self.predictor_path),
+                loaded_at=time.time(),
+                pid=os.getpid(),
+            )
+
+    def models(self):
+        """Return ``(detector, predictor)``, loading them on first use."""
+        if self._predictor is None:
+            self._load()
+        else:
+            self._metrics["hits"] += 1
+        return self._detector, self._predictor
+
+    def warm_up(self):
+        """Load the models now so the first request doesn't pay for it."""
+        self.models()
+        return self.metrics()
+
+    def metrics(self):
+        return dict(self._metrics)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
+
+
+def get_models():
+    return get_registry().models()
+
+
+def warm_up():
+    return get_registry().warm_up()
+
+
+def init_worker():
+    """Process-pool initializer: single-threaded native libs, models preloaded."""
+    import cv2
+    from threadpoolctl import threadpool_limits
+
+    # One process per core already; nested thread pools only oversubscribe
+    cv2.setNumThreads(1)
+    threadpool_limits(1)
+    warm_up()
+
+
+if __name__ == "__main__":
+    # Run from a server start script to pre-load (and sanity check) the models
+    import json
+
+    print(json.dumps(warm_up(), indent=2))
@@ -0,0 +1,140 @@
+"""Match any garment colour against every season's palette.
+
+The index holds, in CIELAB, each season's swatches, a lighter tint and a
+deeper shade of each swatch (a palette colour is still flattering a step
+lighter or darker), and the representative colours of its avoid list.
+There are only a couple of hundred entries, so a brute-force distance
+matrix beats a KD-tree: a query is one ``(n, M)`` array op, and
+:meth:`PaletteIndex.score_season` scores catalogue-sized batches in
+chunks with bounded memory.
+
+Scores are in [-1, 1]: close to a palette colour scores towards +1, close
+to an avoid colour towards -1, far from both scores 0.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from skinsight.features import hex_to_lab, rgb_to_lab
+from skinsight.knowledge import load_knowledge_base
+
+TINT = 0.3    # share of white mixed into a swatch for its tint
+SHADE = 0.25  # share of black mixed into a swatch for its shade
+SIGMA = 12.0  # delta E at which a match has fallen to ~60%
+CHUNK = 16384  # rows per distance block in batch scoring
+
+
+@dataclass(frozen=True, slots=True)
+class Match:
+    season: str
+    name: str
+    hex: str
+    kind: str  # "palette", "tint", "shade" or "avoid"
+    delta_e: float
+
+
+def _hex_of(rgb):
+    return "#{:02X}{:02X}{:02X}".format(*rgb)
+
+
+class PaletteIndex:
+    """Lab-space index of every season's palette and avoid colours."""
+
+    def __init__(self, kb):
+        rows = []
+        for season, record in kb.seasons.items():
+            for swatch in record.colors:
+                rgb = np.array([int(swatch.hex[i:i + 2], 16) for i in (1, 3, 5)], dtype=float)
+                rows.append((season, swatch.name, swatch.hex, "palette"))
+                rows.append((season, f"{swatch.name} (tint)",
+                             _hex_of(np.rint(rgb + (255 - rgb) * TINT).astype(int)), "tint"))
+                rows.append((season, f"{swatch.name} (shade)",
+                             _hex_of(np.rint(rgb * (1 - SHADE)).astype(int)), "shade"))
+            rows += [(season, swatch.name, swatch.hex, "avoid") for swatch in record.avoid]
+
+        self.seasons = tuple(kb.seasons)
+        # entries are grouped by (avoid, season) so per-season minima are a reduceat
+        rows.sort(key=lambda row: (row[3] == "avoid", self.seasons.index(row[0])))
+        self.entries = tuple(rows)
+        self.lab = hex_to_lab([row[2] for row in rows])
+        self.polarity = np.array([-1 if row[3] == "avoid" else 1 for row in rows], dtype=np.int8)
+        self.season_index = np.array([self.seasons.index(row[0]) for row in rows])
+
+        groups = self.season_index + len(self.seasons) * (self.polarity < 0)
+        self._starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+        self._group_ids = groups[self._starts]
+        self._lab_sq = (self.lab ** 2).sum(axis=1)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _distances(self, lab):
+        # |x - y|^2 = |x|^2 - 2 x.y + |y|^2, a single matrix product per block
+        d2 = (lab ** 2).sum(axis=1)[:, None] - 2 * lab @ self.lab.T + self._lab_sq
+        return np.sqrt(np.maximum(d2, 0))
+
+    def nearest(self, hex_code, k=5, season=None):
+        """The ``k`` closest entries to one colour, optionally within a season."""
+        distances = self._distances(hex_to_lab([hex_code]))[0]
+        if season is not None:
+            distances = np.where(self.season_index == self.seasons.index(season), distances, np.inf)
+        k = min(k, int(np.isfinite(distances).sum()))
+        top = np.argpartition(distances, k - 1)[:k] if k else np.array([], dtype=int)
+        top = top[np.argsort(distances[top])]
+        return [Match(*self.entries[i], delta_e=round(float(distances[i]), 2)) for i in top]
+
+    def _group_minima(self, lab):
+        """Minimum distance to each (polarity, season) group, ``(n, 2, seasons)``."""
+        minima = np.full((len(lab), 2 * len(self.seasons)), np.inf)
+        minima[:, self._group_ids] = np.minimum.reduceat(self._distances(lab), self._starts, axis=1)
+        return minima.reshape(len(lab), 2, len(self.seasons))
+
+    def score_lab(self, lab):
+        """Suitability of ``(n, 3)`` Lab colours for every season, ``(n, seasons)``."""
+        out = np.empty((len(lab), len(self.seasons)))
+        for start in range(0, len(lab), CHUNK):
+            minima = self._group_minima(lab[start:start + CHUNK])
+            closeness = np.exp(-0.5 * (minima / SIGMA) ** 2)
+            out[start:start + CHUNK] = closeness[:, 0] - closeness[:, 1]
+        return out
+
+    def score(self, hex_codes):
+        """Suitability of ``"#RRGGBB"`` colours for every season, ``(n, seasons)``."""
+        return self.score_lab(hex_to_lab(hex_codes))
+
+    def score_rgb(self, rgb):
+        """Like :meth:`score` for an ``(n, 3)`` uint8 RGB array."""
+        return self.score_lab(rgb_to_lab(np.asarray(rgb, dtype=np.uint8)))
+
+    def score_season(self, hex_codes, season):
+        """Suitability of many colours for one season, ``(n,)``."""
+        return self.score(hex_codes)[:, self.seasons.index(season)]
+
+
+@lru_cache(maxsize=1)
+def load_palette_index():
+    """The palette index for the loaded knowledge base, built once per process."""
+    return PaletteIndex(load_knowledge_base())
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Match colours against the season palettes.")
+    parser.add_argument("colors", nargs="+", help='hex codes such as "#1F3A93"')
+    parser.add_argument("-k", type=int, default=5, help="matches to list per colour")
+    parser.add_argument("--season", help="only match within this season")
+    args = parser.parse_args(argv)
+
+    index = load_palette_index()
+    scores = index.score(args.colors)
+    for code, row in zip(args.colors, scores):
+        best = sorted(zip(index.seasons, row), key=lambda pair: -pair[1])
+        print(code, " ".join(f"{season}={value:+.2f}" for season, value in best[:3]))
+        for match in index.nearest(code, args.k, args.season):
+            print(f"  {match.delta_e:6.2f}  {match.kind:7} {match.season}: {match.name} {match.hex}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""The image analysis pipeline, independent of any UI."""
+import hashlib
+import json
+
+import numpy as np
+
+from skinsight.classifier import load_classifier
+from skinsight.clustering import DEFAULT_ENGINE, dominant_colors
+from skinsight.decode import DECODE_MAX_SIDE, decode_image
+from skinsight.detection import DETECT_MAX_SIDE, GROUP_UPSAMPLE, detect_faces, landmark_points
+from skinsight.extraction import convert_pixels, polygons_pixels, split_like
+from skinsight.features import FEATURE_NAMES, bgr_to_lab, skin_features
+from skinsight.illumination import ILLUMINATION_MODE, apply_gains, estimate_gains
+from skinsight.models import get_models
+from skinsight.profiling import Profile
+from skinsight.quality import QUALITY_GATE, ImageQualityError, assess, check_exposure
+from skinsight.regions import contrast, region_polygons, summarize
+from skinsight.result import AnalysisResult, FaceResult
+
+# Bump whenever the pipeline can return something different for the same
+# bytes, so cached or checkpointed results from older versions are not reused.
+PIPELINE_VERSION = 15
+
+
+def pipeline_config():
+    """Everything besides the image bytes that can change a result."""
+    return {
+        "pipeline_version": PIPELINE_VERSION,
+        "classifier_version": load_classifier().version,
+        "illumination": ILLUMINATION_MODE,
+        "cluster_engine": DEFAULT_ENGINE,
+        "decode_max_side": DECODE_MAX_SIDE,
+        "detect_max_side": DETECT_MAX_SIDE,
+        "quality_gate": QUALITY_GATE,
+    }
+
+
+def config_fingerprint():
+    """Short key of :func:`pipeline_config`, so caches and checkpoints are only reused under the same settings."""
+    encoded = json.dumps(pipeline_config(), sort_keys=True).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def analyze_details(source, profile=None, all_faces=False, quality_gate=None, illumination=None,
+                    on_face=None):
+    """Analyse an image file/path; returns an :class:`~skinsight.result.AnalysisResult`, or ``None`` if no face.
+
+    Only the largest face is analysed unless ``all_faces`` is set, in which
+    case detection is upsampled to find faces down to about 100 px wide
+    (see :mod:`skinsight.detection`).  Every
+    analysed face appears in ``faces`` with its own season scores,
+    colours and box; the result's own season, scores etc. are the largest
+    face's.  Stage timings are recorded on ``profile`` (a fresh
+    :class:`Profile` by default) and included as ``timings``.
+
+    Unless ``quality_gate`` is false (default: ``SKINSIGHT_QUALITY_GATE``),
+    an image that fails :func:`skinsight.quality.assess` raises
+    :class:`~skinsight.quality.ImageQualityError` before detection runs,
+    and one whose largest face (or, without a face, the whole frame) fails
+    :func:`~skinsight.quality.check_exposure` raises it after detection.
+    The sampled pixels are white-balanced with the ``illumination`` mode
+    (default: ``SKINSIGHT_ILLUMINATION``, see :mod:`skinsight.illumination`).
+    ``on_face(face, lab)`` is called with every :class:`~skinsight.result.FaceResult`
+    and its per-region Lab pixels, e.g. to accumulate statistics without
+    keeping the pixels.
+    """
+    import cv2
+
+    profile = profile or Profile()
+    with profile.stage("models"):
+        detector, predictor = get_models()
+    with profile.stage("decode"):
+        image = decode_image(source)
+    gate = QUALITY_GATE if quality_gate is None else quality_gate
+    with profile.stage("quality"):
+        quality = assess(image)
+    if not quality["ok"] and gate:
+        raise ImageQualityError(quality)
+    with profile.stage("detect"):
+        boxes = detect_faces(image, detector, upsample=GROUP_UPSAMPLE if all_faces else 0)
+    with profile.stage("quality"):
+        # Exposure is judged on the face, so a white or black backdrop does not fail it
+        check_exposure(quality, image, boxes[0] if boxes else None)
+    if not quality["ok"] and gate:
+        raise ImageQualityError(quality)
+
+    if len(boxes) == 0:
+        return None
+    if not all_faces:
+        boxes = boxes[:1]
+
+    # Landmark and sample only around the faces, not the whole photo
+    with profile.stage("landmarks"):
+        landmarks = landmark_points(predictor, image, boxes)
+    with profile.stage("extract"):
+        # Every region of every face is sampled in one pass
+        face_regions = [region_polygons(points) for points in landmarks]
+        owners, polygons = [], []
+        for i, regions in enumerate(face_regions):
+            for name, region in regions.items():
+                owners += [(i, name)] * len(region)
+                polygons += region
+        samples = polygons_pixels(image, polygons)
+    with profile.stage("illumination"):
+        # Sclera gains are per face; the image-wide modes share one estimate
+        mode = illumination or ILLUMINATION_MODE
+        if mode == "sclera":
+            eyes, skin = [[] for _ in face_regions], [[] for _ in face_regions]
+            for (i, name), pixels in zip(owners, samples):
+                if name in ("eyes", "skin"):
+                    (eyes if name == "eyes" else skin)[i].append(pixels)
+            gains = [estimate_gains(mode, eye_bgr=np.concatenate(e), skin_bgr=np.concatenate(k))
+                     for e, k in zip(eyes, skin)]
+        else:
+            gains = [estimate_gains(mode, image)] * len(face_regions)
+        samples = [apply_gains(pixels, gains[i]) for (i, _), pixels in zip(owners, samples)]
+    with profile.stage("extract"):
+        region_bgr = _group(owners, samples, face_regions)
+        skin_samples = [regions["skin"] for regions in region_bgr]
+        hsv_samples = split_like(
+            convert_pixels(np.concatenate(skin_samples), cv2.COLOR_BGR2HSV), skin_samples
+        )
+    with profile.stage("features"):
+        region_lab = _group(owners, split_like(bgr_to_lab(np.concatenate(samples)), samples), face_regions)
+
+    faces, face_labs = [], []
+    for box, face_gains, skin_pixels, bgr, lab in zip(boxes, gains, hsv_samples, region_bgr, region_lab):
+        if len(skin_pixels) < 3:
+            continue
+        with profile.stage("features"):
+            features = skin_features(lab["skin"])
+            summaries = {name: summarize(name, bgr[name], lab[name]) for name in bgr}
+        with profile.stage("cluster"):
+            dominant, weights = dominant_colors(skin_pixels, k=3)
+        faces.append({
+            "dominant_colors": dominant.tolist(),
+            "weights": weights.tolist(),
+            "face_box": tuple(box),
+            "features": dict(zip(FEATURE_NAMES, features.round(3).tolist())),
+            "regions": summaries,
+            "contrast": contrast(summaries),
+            "illumination": {"mode": mode, "gains": face_gains.round(3).tolist()},
+        })
+        face_labs.append(lab)
+    if not faces:
+        return None
+
+    with profile.stage("classify"):
+        # Scores and rankings for every face and season in one pass
+        classifier = load_classifier()
+        X = np.stack([
+            classifier.vectorize(face["features"], face["contrast"] and face["contrast"]["score"])
+            for face in faces
+        ])
+        scores = classifier.score(X).round(4)
+        rankings = np.argsort(-scores, axis=1, kind="stable")
+        faces = tuple(
+            FaceResult(classifier.seasons, dict(zip(classifier.seasons, s.tolist())), tuple(r.tolist()), **face)
+            for face, s, r in zip(faces, scores, rankings)
+        )
+    if on_face is not None:
+        for face, lab in zip(faces, face_labs):
+            on_face(face, lab)
+    return AnalysisResult(faces, profile.as_dict(), quality, PIPELINE_VERSION, classifier.version)
+
+
+def _group(owners, arrays, face_regions):
+    """Regroup per-polygon arrays into ``[{region: pixels}]`` per face."""
+    grouped = [{name: [] for name in regions} for regions in face_regions]
+    for (i, name), array in zip(owners, arrays):
+        grouped[i][name].append(array)
+    return [{name: np.concatenate(parts) for name, parts in regions.items()} for regions in grouped]
+
+
+def analyze_image(source):
+    """Return the :class:`~skinsight.result.AnalysisResult` for an image's largest face, or ``None``.
+
+    ``result.season`` is the verdict; ``result.scores``, ``result.top()``
+    and ``result.margin`` show how clear it is.
+    """
+    return analyze_details(source)
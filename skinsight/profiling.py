@@ -0,0 +1,126 @@
+"""Per-stage timing and memory instrumentation for the pipeline.
+
+A :class:`Profile` is passed through the pipeline and each stage runs inside
+``profile.stage(name)``.  Finished stages are reported to hooks, plain
+callables ``hook(stage, seconds, peak_bytes)``, registered globally with
+:func:`add_hook` or per profile.  :class:`PrometheusCollector` and
+:func:`log_hook` are ready-made hooks.
+
+Peak memory uses ``tracemalloc``, which sees NumPy buffers but not OpenCV's
+internal allocations.  It is off unless ``trace_memory=True`` or
+``SKINSIGHT_TRACE_MEMORY=1`` because tracing slows allocation down.
+``tracemalloc`` is process-wide, so traced stages take a global lock:
+concurrent analyses (Streamlit sessions, service threads) run their
+traced stages one at a time instead of resetting or stopping each
+other's tracing.
+"""
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+TRACE_MEMORY = os.environ.get("SKINSIGHT_TRACE_MEMORY", "") == "1"
+
+_hooks = []
+# Serialises traced stages; re-entrant so a traced stage may open another
+_trace_lock = threading.RLock()
+
+
+def add_hook(hook):
+    _hooks.append(hook)
+    return hook
+
+
+def remove_hook(hook):
+    _hooks.remove(hook)
+
+
+class Profile:
+    def __init__(self, hooks=(), trace_memory=None):
+        self.hooks = list(hooks)
+        self.trace_memory = TRACE_MEMORY if trace_memory is None else trace_memory
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        started_tracing = False
+        if self.trace_memory:
+            _trace_lock.acquire()
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            peak = None
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                if started_tracing:
+                    tracemalloc.stop()
+                _trace_lock.release()
+            self.record(name, seconds, peak)
+
+    def record(self, name, seconds, peak_bytes=None):
+        entry = self.stages.setdefault(name, {"seconds": 0.0, "peak_bytes": None})
+        entry["seconds"] += seconds
+        if peak_bytes is not None:
+            entry["peak_bytes"] = max(entry["peak_bytes"] or 0, peak_bytes)
+        for hook in (*_hooks, *self.hooks):
+            hook(name, seconds, peak_bytes)
+
+    @property
+    def total_seconds(self):
+        return sum(entry["seconds"] for entry in self.stages.values())
+
+    def as_dict(self):
+        return {name: dict(entry) for name, entry in self.stages.items()}
+
+
+class PrometheusCollector:
+    """Hook that aggregates stage timings into Prometheus text format."""
+
+    def __init__(self, prefix="skinsight_stage"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._seconds = {}
+        self._counts = {}
+        self._peaks = {}
+
+    def __call__(self, stage, seconds, peak_bytes):
+        with self._lock:
+            self._seconds[stage] = self._seconds.get(stage, 0.0) + seconds
+            self._counts[stage] = self._counts.get(stage, 0) + 1
+            if peak_bytes is not None:
+                self._peaks[stage] = max(self._peaks.get(stage, 0), peak_bytes)
+
+    def render(self):
+        with self._lock:
+            lines = [
+                f"# HELP {self.prefix}_seconds Time spent in each analysis stage.",
+                f"# TYPE {self.prefix}_seconds summary",
+            ]
+            for stage in sorted(self._seconds):
+                lines.append(f'{self.prefix}_seconds_sum{{stage="{stage}"}} {self._seconds[stage]:.6f}')
+                lines.append(f'{self.prefix}_seconds_count{{stage="{stage}"}} {self._counts[stage]}')
+            if self._peaks:
+                lines.append(f"# HELP {self.prefix}_peak_bytes Largest traced allocation peak per stage.")
+                lines.append(f"# TYPE {self.prefix}_peak_bytes gauge")
+                for stage in sorted(self._peaks):
+                    lines.append(f'{self.prefix}_peak_bytes{{stage="{stage}"}} {self._peaks[stage]}')
+        return "\n".join(lines) + "\n"
+
+
+def log_hook(logger=None, level=logging.INFO):
+    """Build a hook that emits one JSON log line per finished stage."""
+    logger = logger or logging.getLogger("skinsight.profiling")
+
+    def hook(stage, seconds, peak_bytes):
+        logger.log(level, json.dumps({"stage": stage, "seconds": round(seconds, 6), "peak_bytes": peak_bytes}))
+
+    return hook
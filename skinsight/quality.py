@@ -0,0 +1,137 @@
+"""Cheap image-quality gate run before face detection.
+
+A blurry, dark, colour-cast or tiny photo costs a full detection and
+clustering pass and then yields "no face" or a wrong season.  The gate
+measures the decoded image on a small thumbnail (a few milliseconds) and
+rejects it with advice the user can act on.  :func:`assess` runs before
+detection:
+
+* resolution  - the short side of the decoded image
+* sharpness   - variance of the Laplacian of the greyscale thumbnail
+
+and :func:`check_exposure` after it:
+
+* exposure    - mean brightness and the share of crushed or blown pixels,
+  measured on the face box so a white or black backdrop (passport-style
+  photos) does not count; on the whole frame when no face was found
+
+A colour cast - distance of the mean a*/b* from neutral (grey-world) - is
+only a warning.  Skin is itself far from neutral, so a close-up of medium
+or olive skin reads as a cast, and real casts are white-balanced away by
+:mod:`skinsight.illumination` later on.
+
+Thresholds are module constants; set ``SKINSIGHT_QUALITY_GATE=0`` to turn
+the gate off.
+"""
+import os
+
+import numpy as np
+
+from skinsight.features import bgr_to_lab
+
+QUALITY_GATE = os.environ.get("SKINSIGHT_QUALITY_GATE", "1") != "0"
+THUMBNAIL_SIDE = 256
+MIN_SIDE = 160           # px, short side
+MIN_SHARPNESS = 20.0     # Laplacian variance on the thumbnail
+DARK_MEAN, BRIGHT_MEAN = 45, 220
+CLIPPED_SHARE = 0.5      # share of pixels crushed to black or blown to white
+MAX_CAST = 28.0          # delta E of the mean colour from grey
+
+
+class ImageQualityError(ValueError):
+    """Raised by the pipeline when an image fails the quality gate."""
+
+    def __init__(self, report):
+        self.report = report
+        super().__init__("; ".join(problem["message"] for problem in report["problems"]))
+
+    def __reduce__(self):
+        # Rebuild from the report when it crosses a process boundary
+        return type(self), (self.report,)
+
+
+def _thumbnail(image):
+    import cv2
+
+    height, width = image.shape[:2]
+    scale = THUMBNAIL_SIDE / max(height, width)
+    if scale >= 1:
+        return image
+    return cv2.resize(image, (max(1, round(width * scale)), max(1, round(height * scale))),
+                      interpolation=cv2.INTER_AREA)
+
+
+def _cast_name(a, b):
+    if abs(a) > abs(b):
+        return "magenta" if a > 0 else "green"
+    return "yellow" if b > 0 else "blue"
+
+
+def assess(image):
+    """Measure a BGR image; returns ``{"ok", "metrics", "problems", "warnings"}``.
+
+    Each problem or warning is ``{"code", "message"}``, the message being
+    advice for the user.  Only problems make ``ok`` false.  Exposure is
+    not checked here; see :func:`check_exposure`.
+    """
+    import cv2
+
+    height, width = image.shape[:2]
+    thumb = _thumbnail(image)
+    gray = cv2.cvtColor(thumb, cv2.COLOR_BGR2GRAY)
+    lab = bgr_to_lab(thumb.reshape(-1, 3))
+    # Near-black and near-white pixels carry no reliable colour
+    lit = lab[(lab[:, 0] > 15) & (lab[:, 0] < 95)]
+    a, b = lit[:, 1:].mean(axis=0) if len(lit) else (0.0, 0.0)
+
+    metrics = {
+        "width": width,
+        "height": height,
+        "sharpness": round(float(cv2.Laplacian(gray, cv2.CV_64F).var()), 2),
+        "cast": round(float(np.hypot(a, b)), 2),
+    }
+
+    problems = []
+    if min(height, width) < MIN_SIDE:
+        problems.append({"code": "too_small", "message":
+                         f"The photo is only {width}x{height} px; use one at least {MIN_SIDE} px on each side."})
+    if metrics["sharpness"] < MIN_SHARPNESS:
+        problems.append({"code": "blurry", "message":
+                         "The photo is blurry; hold the camera steady and make sure your face is in focus."})
+    warnings = []
+    if metrics["cast"] > MAX_CAST:
+        warnings.append({"code": "color_cast", "message":
+                         f"The photo looks {_cast_name(a, b)}; if the light is coloured or tinted, "
+                         "retake it in daylight for the most reliable season."})
+    return {"ok": not problems, "metrics": metrics, "problems": problems, "warnings": warnings}
+
+
+def check_exposure(report, image, face_box=None):
+    """Add exposure metrics and problems to an :func:`assess` report, in place.
+
+    Exposure is measured inside ``face_box`` (``(left, top, right,
+    bottom)``), or on the whole image when it is None.  Returns ``report``.
+    """
+    import cv2
+
+    if face_box is not None:
+        left, top, right, bottom = face_box
+        if right > left and bottom > top:
+            image = image[top:bottom, left:right]
+    gray = cv2.cvtColor(_thumbnail(image), cv2.COLOR_BGR2GRAY)
+    histogram = np.bincount(gray.ravel(), minlength=256) / gray.size
+    metrics = report["metrics"]
+    metrics.update(
+        exposure_region="face" if face_box is not None else "frame",
+        brightness=round(float(gray.mean()), 2),
+        dark_share=round(float(histogram[:16].sum()), 3),
+        bright_share=round(float(histogram[240:].sum()), 3),
+    )
+    if metrics["brightness"] < DARK_MEAN or metrics["dark_share"] > CLIPPED_SHARE:
+        report["problems"].append({"code": "underexposed", "message":
+                                   "The photo is too dark; face a window or another soft light source."})
+    elif metrics["brightness"] > BRIGHT_MEAN or metrics["bright_share"] > CLIPPED_SHARE:
+        report["problems"].append({"code": "overexposed", "message":
+                                   "The photo is washed out; avoid direct sun or flash on your face."})
+    report["ok"] = not report["problems"]
+    return report
@@ -0,0 +1,125 @@
+"""Occasion looks for every season, gender and occasion.
+
+Each season only curates a few occasions.  For the rest, the most similar
+curated occasion is found (same category, similar formality, same time of
+day), and a look is synthesised from the season's own palette and metals,
+keeping that occasion's shoes and makeup/grooming.  The whole
+season x gender x occasion matrix is built once per process, so a
+request-time lookup is a single dict access.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+from skinsight.features import hex_to_lab
+from skinsight.knowledge import GENDERS, Look, load_knowledge_base
+
+# Relative weight of each similarity component
+CATEGORY_WEIGHT = 1.0
+FORMALITY_WEIGHT = 2.0
+EVENING_WEIGHT = 0.5
+
+# Outfit templates by formality; {accent} and {neutral} come from the palette
+OUTFITS = {
+    "female": {
+        5: "Floor-length {accent} gown",
+        4: "Tailored {neutral} suit with a {accent} blouse",
+        3: "{accent} midi dress with a {neutral} layer",
+        2: "{accent} blouse with {neutral} trousers",
+        1: "Relaxed {accent} knit with {neutral} jeans",
+    },
+    "male": {
+        5: "Tuxedo with a {accent} pocket square",
+        4: "Tailored {neutral} suit with a {accent} tie",
+        3: "{neutral} blazer over a {accent} shirt",
+        2: "{accent} shirt with {neutral} chinos",
+        1: "Relaxed {accent} knit with {neutral} jeans",
+    },
+}
+ACCESSORIES = {
+    5: "Statement {metal} pieces",
+    4: "Understated {metal} watch",
+    3: "{metal} accents",
+    2: "Simple {metal} jewelry",
+    1: "Minimal {metal} accessory",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Recommendation:
+    look: Look
+    curated: bool
+    based_on: Optional[str] = None  # the curated occasion a synthesised look borrows from
+
+
+def similarity_matrix(profiles):
+    """Pairwise occasion similarity as an ``(n, n)`` array, in ``profiles`` order."""
+    category = np.array([p.category for p in profiles])
+    formality = np.array([p.formality for p in profiles], dtype=float)
+    evening = np.array([p.evening for p in profiles])
+    return (
+        CATEGORY_WEIGHT * (category[:, None] == category[None, :])
+        + FORMALITY_WEIGHT * (1 - np.abs(formality[:, None] - formality[None, :]) / 4)
+        + EVENING_WEIGHT * (evening[:, None] == evening[None, :])
+    )
+
+
+def _palette_roles(season):
+    """Pick the most and least chromatic palette colours as accent and neutral."""
+    lab = hex_to_lab([swatch.hex for swatch in season.colors])
+    chroma = np.hypot(lab[:, 1], lab[:, 2])
+    return season.colors[int(chroma.argmax())].name, season.colors[int(chroma.argmin())].name
+
+
+def _sentence(text):
+    return text[:1].upper() + text[1:]
+
+
+def synthesize(season, gender, profile, base):
+    accent, neutral = _palette_roles(season)
+    metal = season.metals[0] if season.metals else "metallic"
+    outfit = OUTFITS[gender][profile.formality].format(accent=accent.lower(), neutral=neutral.lower())
+    return Look(
+        outfit=_sentence(outfit),
+        shoes=base.shoes,
+        accessories=_sentence(ACCESSORIES[profile.formality].format(metal=metal.lower())),
+        finishing=base.finishing,
+    )
+
+
+def build_matrix(kb=None):
+    """Return ``{(season, gender, occasion): Recommendation}`` for every combination."""
+    kb = kb or load_knowledge_base()
+    names = list(kb.occasions)
+    profiles = [kb.occasions[name] for name in names]
+    similarity = similarity_matrix(profiles)
+    matrix = {}
+    for season in kb.seasons.values():
+        for gender in GENDERS:
+            view = season.view(gender)
+            curated = [i for i, name in enumerate(names) if name in view.occasions]
+            for i, name in enumerate(names):
+                if name in view.occasions:
+                    matrix[season.name, gender, name] = Recommendation(view.occasions[name], curated=True)
+                elif curated:
+                    nearest = names[curated[int(similarity[i, curated].argmax())]]
+                    look = synthesize(season, gender, profiles[i], view.occasions[nearest])
+                    matrix[season.name, gender, name] = Recommendation(look, curated=False, based_on=nearest)
+    return matrix
+
+
+@lru_cache(maxsize=None)
+def _matrix():
+    return build_matrix()
+
+
+def recommend(season, gender, occasion):
+    """Look up the :class:`Recommendation`, or ``None`` if the season has no looks at all."""
+    return _matrix().get((season, gender.lower(), occasion))
+
+
+def warm_up():
+    """Build the matrix now (e.g. at server start) rather than on the first request."""
+    return len(_matrix())
@@ -0,0 +1,99 @@
+"""Face regions sampled from the 68-point landmark geometry.
+
+Skin is sampled from both cheeks and a forehead band, not the hull of
+the whole face: that hull also covers the brows, eyes, nostrils and lips,
+whose dark pixels drag the skin mean, spread and percentiles down.
+Besides skin, each face gets eye, hair and lip regions.  They are cropped
+and sampled in the same extraction call as the skin, and each gets a
+small colour summary.  Together they give the skin/hair/eye
+contrast that seasonal colour analysis is based on.
+"""
+import numpy as np
+
+# Jaw, nostril and lower-lid points around each cheek
+LEFT_CHEEK = [1, 2, 3, 31, 40, 41]
+RIGHT_CHEEK = [15, 14, 13, 35, 47, 46]
+CHEEK_SHRINK = 0.8    # pulled towards their centre, off the lids, nose and jaw edge
+LEFT_EYE = slice(36, 42)
+RIGHT_EYE = slice(42, 48)
+BROWS = slice(17, 27)
+LIPS = slice(48, 68)
+NOSE_BRIDGE = (27, 33)
+
+# Forehead and hair bands above the brows, in multiples of the nose length (27 -> 33)
+FOREHEAD_BAND = (0.2, 0.6)
+HAIR_BAND = (1.2, 1.7)
+
+
+def region_polygons(landmarks):
+    """Return ``{region: [polygon, ...]}`` for one face's ``(68, 2)`` landmarks."""
+    import cv2
+
+    def hull(points):
+        return cv2.convexHull(points).reshape(-1, 2)
+
+    def band(left, right, bottom, top):
+        return np.array([[left, bottom], [right, bottom], [right, top], [left, top]], dtype=np.int32)
+
+    def cheek(indices):
+        points = landmarks[indices].astype(np.float64)
+        centre = points.mean(axis=0)
+        return hull(np.rint(centre + (points - centre) * CHEEK_SHRINK).astype(np.int32))
+
+    brows = landmarks[BROWS]
+    nose = np.linalg.norm(landmarks[NOSE_BRIDGE[1]] - landmarks[NOSE_BRIDGE[0]])
+    brow_top = brows[:, 1].min()
+    left, right = brows[:, 0].min(), brows[:, 0].max()
+    low, high = (int(nose * k) for k in HAIR_BAND)
+    hair = band(left, right, brow_top - low, brow_top - high)
+    # The forehead spans the brow peaks (19 and 24), clear of the temples
+    low, high = (int(nose * k) for k in FOREHEAD_BAND)
+    forehead = band(landmarks[19, 0], landmarks[24, 0], brow_top - low, brow_top - high)
+    return {
+        "skin": [cheek(LEFT_CHEEK), cheek(RIGHT_CHEEK), forehead],
+        "eyes": [hull(landmarks[LEFT_EYE]), hull(landmarks[RIGHT_EYE])],
+        "hair": [hair],
+        "lips": [hull(landmarks[LIPS])],
+    }
+
+
+def _hex(bgr):
+    b, g, r = (int(round(c)) for c in bgr)
+    return f"#{r:02X}{g:02X}{b:02X}"
+
+
+def summarize(region, bgr, lab):
+    """Small colour summary (median Lab and colour) for one region's pixels."""
+    if len(bgr) == 0:
+        return None
+    if region == "eyes":
+        # The darker half of the eye opening is iris/pupil, the rest sclera and lids
+        dark = lab[:, 0] <= np.median(lab[:, 0])
+        bgr, lab = bgr[dark], lab[dark]
+    return {
+        "lab": np.median(lab, axis=0).round(2).tolist(),
+        "hex": _hex(np.median(bgr, axis=0)),
+        "pixels": int(len(bgr)),
+    }
+
+
+def contrast(summaries):
+    """Skin/hair/eye contrast from the region summaries.
+
+    ``score`` is the largest lightness difference between skin and hair or
+    eyes, scaled to 0-1.  The pairwise values are CIE76 colour differences.
+    """
+    skin = summaries.get("skin")
+    if skin is None:
+        return None
+    result = {}
+    lightness = []
+    for other in ("hair", "eyes"):
+        if summaries.get(other) is None:
+            result[f"skin_{other}"] = None
+            continue
+        delta = np.subtract(skin["lab"], summaries[other]["lab"])
+        result[f"skin_{other}"] = round(float(np.linalg.norm(delta)), 2)
+        lightness.append(abs(delta[0]))
+    result["score"] = round(float(max(lightness)) / 100, 3) if lightness else None
+    return result
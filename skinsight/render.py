@@ -0,0 +1,157 @@
+"""Pre-rendered HTML fragments for the season result pages.
+
+Result pages only depend on (season, gender, occasion), so every fragment is
+rendered once per process and cached.  Each fragment is a single HTML block
+that the Streamlit app sends with one ``st.markdown`` call instead of one
+call per card.  ``python -m skinsight.render -o fragments.json`` prebuilds
+every fragment at deploy time; point ``SKINSIGHT_FRAGMENTS`` at the file
+and fragments are served from it without rendering at all.
+"""
+import argparse
+import html
+import json
+import os
+from functools import lru_cache
+
+from skinsight.knowledge import GENDERS, load_knowledge_base
+from skinsight.recommendations import recommend
+
+FRAGMENTS_PATH = os.environ.get("SKINSIGHT_FRAGMENTS")
+
+# Extra CSS the fragments rely on, appended to the app's stylesheet
+CSS = """
+    .card-grid {
+        display: grid;
+        grid-template-columns: repeat(2, minmax(0, 1fr));
+        column-gap: 1rem;
+    }
+    .palette-grid {
+        display: grid;
+        grid-template-columns: repeat(6, minmax(0, 1fr));
+        column-gap: 1rem;
+    }
+"""
+
+
+def _card(name, reason, css_class="season-card"):
+    return (f'<div class="{css_class}"><h4>{html.escape(name)}</h4>'
+            f'<p>{html.escape(reason)}</p></div>')
+
+
+def _swatch(hex_code):
+    return f'<div style="background-color:{hex_code};" class="color-swatch"></div>'
+
+
+def _colors(season, gender):
+    cards = "".join(
+        f"<div>{_swatch(s.hex)}{_card(s.name, s.reason)}</div>" for s in season.colors
+    )
+    return f'<div class="card-grid">{cards}</div>'
+
+
+def _hair(season, gender):
+    return "".join(_card(item.name, item.reason) for item in season.hair)
+
+
+def _makeup(season, gender):
+    return "".join(_card(item.name, item.reason) for item in season.view(gender).makeup)
+
+
+def _jewelry(season, gender):
+    cards = "".join(_card(item.name, item.reason) for item in season.view(gender).jewelry)
+    return f'<div class="card-grid">{cards}</div>'
+
+
+def _avoid(season, gender):
+    return "".join(_card(item.name, item.reason, "avoid-card") for item in season.avoid)
+
+
+def _palette(season, gender):
+    cells = "".join(
+        f'<div>{_swatch(s.hex)}<div style="text-align: center;">{html.escape(s.name)}</div></div>'
+        for s in season.colors
+    )
+    return f'<div class="palette-grid">{cells}</div>'
+
+
+def render_look(occasion, look, finishing_label, based_on=None):
+    note = (
+        f'<p><em>Built from your palette, adapted from your {html.escape(based_on)} look.</em></p>'
+        if based_on else ""
+    )
+    return (
+        f'<div class="occasion-card"><h3>{html.escape(occasion)} Look</h3>'
+        f"<p><strong>Outfit:</strong> {html.escape(look.outfit)}</p>"
+        f"<p><strong>Shoes:</strong> {html.escape(look.shoes)}</p>"
+        f"<p><strong>Accessories:</strong> {html.escape(look.accessories)}</p>"
+        f"<p><strong>{finishing_label}:</strong> {html.escape(look.finishing)}</p>{note}</div>"
+    )
+
+
+def _occasion(season, gender, occasion):
+    recommendation = recommend(season.name, gender, occasion)
+    if recommendation is None:
+        return None
+    return render_look(occasion, recommendation.look, season.view(gender).finishing_label, recommendation.based_on)
+
+
+RENDERERS = {
+    "colors": _colors,
+    "hair": _hair,
+    "makeup": _makeup,
+    "jewelry": _jewelry,
+    "avoid": _avoid,
+    "palette": _palette,
+}
+
+
+def _key(kind, season, gender, occasion=""):
+    return f"{kind}|{season}|{gender.lower()}|{occasion}"
+
+
+@lru_cache(maxsize=None)
+def _prebuilt(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=None)
+def fragment(kind, season, gender, occasion=""):
+    """Return the HTML for one fragment, or ``None`` if there is nothing to show."""
+    if FRAGMENTS_PATH:
+        key = _key(kind, season, gender, occasion)
+        prebuilt = _prebuilt(FRAGMENTS_PATH)
+        if key in prebuilt:
+            return prebuilt[key]
+    record = load_knowledge_base().seasons[season]
+    if kind == "occasion":
+        return _occasion(record, gender.lower(), occasion)
+    return RENDERERS[kind](record, gender.lower())
+
+
+def build_all():
+    """Render every fragment for every season, gender and occasion."""
+    kb = load_knowledge_base()
+    occasions = [o for group in kb.occasion_types.values() for o in group]
+    fragments = {}
+    for season in kb.seasons:
+        for gender in GENDERS:
+            for kind in RENDERERS:
+                fragments[_key(kind, season, gender)] = fragment(kind, season, gender)
+            for occasion in occasions:
+                fragments[_key("occasion", season, gender, occasion)] = fragment("occasion", season, gender, occasion)
+    return fragments
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m skinsight.render", description="Prebuild result-page HTML fragments.")
+    parser.add_argument("-o", "--output", required=True, help="JSON file to write")
+    args = parser.parse_args(argv)
+    fragments = build_all()
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(fragments, f, ensure_ascii=False)
+    print(f"Wrote {len(fragments)} fragments to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
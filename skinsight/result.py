@@ -0,0 +1,149 @@
+"""Structured analysis results.
+
+:func:`~skinsight.pipeline.analyze_details` returns an
+:class:`AnalysisResult`: one :class:`FaceResult` per analysed face, largest
+first, plus stage timings and the quality report.  Every face carries the
+classifier's relative score for every season (a softmax share, not a
+calibrated probability) and the seasons ranked best first, so a
+borderline verdict can be told from a clear one and the alternatives can
+be shown.  :meth:`AnalysisResult.as_dict` gives the
+JSON-ready form (with ``pipeline_version`` and ``classifier_version``, so
+a stored score vector can be reused until either changes) and
+:meth:`AnalysisResult.from_dict` reads it back.
+"""
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+TOP_K = 3
+
+
+@dataclass(frozen=True, slots=True)
+class FaceResult:
+    seasons: Tuple[str, ...]
+    scores: dict                      # season -> relative score, in ``seasons`` order, summing to 1
+    ranking: Tuple[int, ...]          # indices into ``seasons``, best first
+    features: dict
+    dominant_colors: list             # HSV cluster centres, largest cluster first
+    weights: list                     # pixel share of each cluster
+    face_box: tuple
+    regions: dict
+    contrast: Optional[dict]
+    illumination: dict
+
+    @property
+    def season(self):
+        return self.seasons[self.ranking[0]]
+
+    @property
+    def confidence(self):
+        """Relative score of the chosen season; uncalibrated, so not the chance it is right."""
+        return self.scores[self.season]
+
+    @property
+    def margin(self):
+        """Lead of the chosen season over the runner-up; small means borderline."""
+        if len(self.ranking) < 2:
+            return self.confidence
+        return round(self.confidence - self.scores[self.seasons[self.ranking[1]]], 4)
+
+    def top(self, k=TOP_K):
+        """The ``k`` best ``(season, score)`` pairs."""
+        return [(self.seasons[i], self.scores[self.seasons[i]]) for i in self.ranking[:k]]
+
+    def as_dict(self, k=TOP_K):
+        return {
+            "season": self.season,
+            "confidence": self.confidence,
+            "margin": self.margin,
+            "top": [{"season": season, "score": score} for season, score in self.top(k)],
+            "scores": self.scores,
+            "features": self.features,
+            "dominant_colors": self.dominant_colors,
+            "weights": self.weights,
+            "face_box": list(self.face_box),
+            "regions": self.regions,
+            "contrast": self.contrast,
+            "illumination": self.illumination,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        seasons = tuple(data["scores"])
+        return cls(
+            seasons=seasons,
+            scores=dict(data["scores"]),
+            ranking=tuple(sorted(range(len(seasons)), key=lambda i: -data["scores"][seasons[i]])),
+            features=data["features"],
+            dominant_colors=data["dominant_colors"],
+            weights=data["weights"],
+            face_box=tuple(data["face_box"]),
+            regions=data["regions"],
+            contrast=data["contrast"],
+            illumination=data["illumination"],
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class AnalysisResult:
+    faces: Tuple[FaceResult, ...]
+    timings: dict
+    quality: dict
+    pipeline_version: int
+    classifier_version: int
+
+    # The largest face stands for the whole photo
+    @property
+    def face(self):
+        return self.faces[0]
+
+    @property
+    def season(self):
+        return self.face.season
+
+    @property
+    def confidence(self):
+        return self.face.confidence
+
+    @property
+    def margin(self):
+        return self.face.margin
+
+    @property
+    def scores(self):
+        return self.face.scores
+
+    @property
+    def features(self):
+        return self.face.features
+
+    @property
+    def dominant_colors(self):
+        return self.face.dominant_colors
+
+    @property
+    def weights(self):
+        return self.face.weights
+
+    def top(self, k=TOP_K):
+        return self.face.top(k)
+
+    def as_dict(self, k=TOP_K):
+        """JSON-ready dict: the largest face's fields, then every face under ``"faces"``."""
+        return dict(
+            self.face.as_dict(k),
+            faces=[face.as_dict(k) for face in self.faces],
+            timings=self.timings,
+            quality=self.quality,
+            pipeline_version=self.pipeline_version,
+            classifier_version=self.classifier_version,
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            faces=tuple(FaceResult.from_dict(face) for face in data["faces"]),
+            timings=data["timings"],
+            quality=data["quality"],
+            pipeline_version=data["pipeline_version"],
+            classifier_version=data["classifier_version"],
+        )
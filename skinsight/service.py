@@ -0,0 +1,231 @@
+"""HTTP inference service.
+
+    python -m skinsight.service --port 8080 --workers 4 --queue 16
+
+Endpoints:
+
+* ``POST /analyze``: the image as the raw body, or as an ``image`` field of
+  a multipart form.  Returns the season, its relative score
+  (``confidence``, not a calibrated probability) and margin over the
+  runner-up, the top alternatives, every season's score and the rest of
+  :meth:`~skinsight.result.AnalysisResult.as_dict`, plus the season's
+  recommendation payload from ``SEASONS``.  ``?faces=all`` analyses
+  every face in the photo instead of only the largest one.  Photos that fail
+  the quality gate get ``422`` with a list of ``problems`` to fix; advisory
+  quality ``warnings`` (such as a colour cast) come with the result.
+* ``GET /healthz``: liveness and current load.
+* ``GET /metrics``: Prometheus stage timings and request counters.
+
+Requests are accepted on an asyncio (aiohttp) front end and the CPU-bound
+analysis runs on a bounded process pool.  Once ``workers + queue`` requests
+are in flight, new ones get ``429``.  Slow analyses get ``504`` after
+``--timeout`` seconds.  A worker that dies (e.g. a native crash) breaks
+the pool; it is replaced and the affected requests get ``503``.  On
+SIGINT/SIGTERM the server stops accepting work and lets in-flight
+analyses finish before exiting.
+"""
+import argparse
+import asyncio
+import io
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from skinsight.classifier import load_classifier
+from skinsight.knowledge import load_knowledge_base, load_raw
+from skinsight.models import init_worker, warm_up
+from skinsight.pipeline import analyze_details
+from skinsight.profiling import PrometheusCollector
+from skinsight.quality import ImageQualityError
+
+log = logging.getLogger("skinsight.service")
+
+MAX_UPLOAD_BYTES = 25 * 1024 * 1024
+
+
+def analyze_bytes(data, all_faces=False):
+    return analyze_details(io.BytesIO(data), all_faces=all_faces)
+
+
+def build_response(result):
+    """:meth:`AnalysisResult.as_dict` plus the season's recommendations and any quality warnings."""
+    return dict(
+        result.as_dict(),
+        recommendations=load_raw()["seasons"].get(result.season),
+        warnings=result.quality.get("warnings", []),
+    )
+
+
+class AnalysisService:
+    def __init__(self, workers=2, queue_size=8, timeout=30.0):
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.timeout = timeout
+        self.in_flight = 0
+        self.draining = False
+        self.pool = None
+        self.pool_restarts = 0
+        self.stage_metrics = PrometheusCollector()
+        self.counters = {"ok": 0, "no_face": 0, "low_quality": 0, "bad_request": 0, "rejected": 0, "timeout": 0,
+                         "worker_crash": 0, "error": 0}
+
+    async def start(self, app):
+        # Fail fast on a broken knowledge base or classifier table
+        load_knowledge_base()
+        load_classifier()
+        self.pool = self._new_pool()
+        # Spawn every worker (the initializer loads its models) before taking traffic
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[
+            loop.run_in_executor(self.pool, warm_up) for _ in range(self.workers)
+        ])
+        log.info("Service ready with %d workers, capacity %d", self.workers, self.capacity)
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker)
+
+    def _replace_pool(self, broken):
+        """Swap in a fresh pool after a worker died; a dead worker breaks the whole pool."""
+        if self.pool is not broken or self.draining:
+            return  # another request already replaced it
+        log.error("A worker process died; restarting the pool")
+        self.pool = self._new_pool()
+        self.pool_restarts += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    async def stop(self, app):
+        self.draining = True
+        log.info("Draining %d in-flight requests", self.in_flight)
+        await asyncio.get_running_loop().run_in_executor(
+            None, lambda: self.pool.shutdown(wait=True, cancel_futures=False)
+        )
+
+    def _release(self, _future):
+        self.in_flight -= 1
+
+    async def _read_image(self, request):
+        if request.content_type.startswith("multipart/"):
+            form = await request.post()
+            field = form.get("image")
+            return field.file.read() if field is not None and hasattr(field, "file") else None
+        return await request.read()
+
+    async def analyze(self, request):
+        from aiohttp import web
+
+        if self.draining:
+            return web.json_response({"error": "shutting down"}, status=503)
+        if self.in_flight >= self.capacity:
+            self.counters["rejected"] += 1
+            return web.json_response({"error": "server busy, retry later"}, status=429,
+                                     headers={"Retry-After": "1"})
+
+        # The slot is taken before the body is read, so slow uploads count towards capacity
+        self.in_flight += 1
+        future = None
+        pool = self.pool
+        try:
+            data = await self._read_image(request)
+            if not data:
+                self.counters["bad_request"] += 1
+                return web.json_response({"error": "expected image bytes or an 'image' form field"}, status=400)
+            all_faces = request.query.get("faces") == "all"
+            future = asyncio.get_running_loop().run_in_executor(pool, analyze_bytes, data, all_faces)
+        except BrokenProcessPool:
+            self._replace_pool(pool)
+            self.counters["worker_crash"] += 1
+            return web.json_response({"error": "analysis worker restarting, retry later"}, status=503,
+                                     headers={"Retry-After": "1"})
+        finally:
+            if future is None:
+                self.in_flight -= 1
+        # The slot is held until the worker is really done, even after a timeout
+        future.add_done_callback(self._release)
+        try:
+            result = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.counters["timeout"] += 1
+            return web.json_response({"error": "analysis timed out"}, status=504)
+        except BrokenProcessPool:
+            self._replace_pool(pool)
+            self.counters["worker_crash"] += 1
+            return web.json_response({"error": "analysis worker crashed, retry later"}, status=503,
+                                     headers={"Retry-After": "1"})
+        except ImageQualityError as exc:
+            self.counters["low_quality"] += 1
+            return web.json_response({"error": "image quality too low", "problems": exc.report["problems"],
+                                      "quality": exc.report["metrics"]}, status=422)
+        except Exception as exc:
+            log.exception("Analysis failed")
+            self.counters["error"] += 1
+            status = 400 if isinstance(exc, (OSError, ValueError)) else 500
+            return web.json_response({"error": f"{type(exc).__name__}: {exc}"}, status=status)
+
+        if result is None:
+            self.counters["no_face"] += 1
+            return web.json_response({"error": "no face detected"}, status=422)
+        for stage, timing in result.timings.items():
+            self.stage_metrics(stage, timing["seconds"], timing["peak_bytes"])
+        self.counters["ok"] += 1
+        return web.json_response(build_response(result))
+
+    async def healthz(self, request):
+        from aiohttp import web
+
+        return web.json_response({
+            "status": "draining" if self.draining else "ok",
+            "in_flight": self.in_flight,
+            "capacity": self.capacity,
+            "pool_restarts": self.pool_restarts,
+        })
+
+    async def metrics(self, request):
+        from aiohttp import web
+
+        lines = [
+            "# HELP skinsight_requests_total Analysis requests by outcome.",
+            "# TYPE skinsight_requests_total counter",
+            *(f'skinsight_requests_total{{outcome="{k}"}} {v}' for k, v in self.counters.items()),
+            "# HELP skinsight_in_flight Requests currently queued or running.",
+            "# TYPE skinsight_in_flight gauge",
+            f"skinsight_in_flight {self.in_flight}",
+            "# HELP skinsight_pool_restarts_total Worker pools replaced after a worker died.",
+            "# TYPE skinsight_pool_restarts_total counter",
+            f"skinsight_pool_restarts_total {self.pool_restarts}",
+        ]
+        return web.Response(text="\n".join(lines) + "\n" + self.stage_metrics.render(),
+                            content_type="text/plain")
+
+
+def create_app(workers=2, queue_size=8, timeout=30.0, max_upload_bytes=MAX_UPLOAD_BYTES):
+    from aiohttp import web
+
+    service = AnalysisService(workers, queue_size, timeout)
+    app = web.Application(client_max_size=max_upload_bytes)
+    app.on_startup.append(service.start)
+    app.on_shutdown.append(service.stop)
+    app.add_routes([
+        web.post("/analyze", service.analyze),
+        web.get("/healthz", service.healthz),
+        web.get("/metrics", service.metrics),
+    ])
+    return app
+
+
+def main(argv=None):
+    from aiohttp import web
+
+    parser = argparse.ArgumentParser(prog="python -m skinsight.service", description="Color season HTTP API.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=2, help="analysis processes")
+    parser.add_argument("--queue", type=int, default=8, help="requests allowed to wait for a worker")
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds before a request gets 504")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    web.run_app(create_app(args.workers, args.queue, args.timeout), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""Live analysis of camera or video frames.
+
+    python -m skinsight.stream 0                      # camera index
+    python -m skinsight.stream mirror.mp4 --detect-every 10 --window 60
+    python -m skinsight.stream mirror.mp4 -o frames.jsonl --max-frames 300
+
+The HOG detector and the shape predictor only run every ``detect_every``
+frames (or when tracking is lost).  In between, the 68 landmarks are
+carried forward with pyramidal Lucas-Kanade optical flow.  Each frame
+contributes its season scores and dominant skin colour to a sliding
+window, and the reported season is the argmax of the window's mean
+scores, so it does not flicker from frame to frame.  A few frames without
+a face (a blink, a turned head, motion blur) keep the window; it is only
+cleared after ``max_misses`` consecutive misses, or by :meth:`reset`.
+Frame, greyscale and window arrays are allocated once and reused.
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from skinsight.classifier import load_classifier
+from skinsight.clustering import dominant_colors
+from skinsight.detection import detect_faces, landmark_points
+from skinsight.extraction import convert_pixels, polygons_pixels
+from skinsight.features import FEATURE_NAMES, bgr_to_lab, skin_features
+from skinsight.illumination import ILLUMINATION_MODE, apply_gains, estimate_gains
+from skinsight.models import get_models
+from skinsight.regions import contrast, region_polygons, summarize
+
+DETECT_EVERY = 5
+WINDOW = 30
+PIXEL_STRIDE = 4      # every 4th region pixel is enough for per-frame statistics
+MIN_TRACKED = 0.8     # re-detect when fewer landmarks than this survive the flow
+MAX_MISSES = 15       # consecutive frames without a face before the window is cleared
+FLOW_PARAMS = {"winSize": (21, 21), "maxLevel": 3}
+
+
+class StreamAnalyzer:
+    """Per-frame analysis with detection skipping and a sliding-window season."""
+
+    def __init__(self, detect_every=DETECT_EVERY, window=WINDOW, illumination=None, max_misses=MAX_MISSES):
+        self.detect_every = detect_every
+        self.window = window
+        self.max_misses = max_misses
+        self.illumination = illumination or ILLUMINATION_MODE
+        self.classifier = load_classifier()
+        self.detector, self.predictor = get_models()
+
+        self.frame_index = 0
+        self.since_detect = None  # frames since the last detection, None when no face is tracked
+        self.misses = 0           # consecutive frames without a face
+        self._gray = self._prev_gray = None
+        self._points = np.zeros((68, 2), dtype=np.float32)
+        self._int_points = np.zeros((68, 2), dtype=np.int32)
+        self._scores = np.zeros((window, len(self.classifier.seasons)))
+        self._colors = np.zeros((window, 3))
+        self._filled = self._cursor = 0
+
+    def reset(self):
+        """Forget the tracked face and the window, e.g. when a new person steps up."""
+        self.since_detect = None
+        self.misses = 0
+        self._filled = self._cursor = 0
+
+    def _to_gray(self, frame):
+        import cv2
+
+        if self._gray is None or self._gray.shape != frame.shape[:2]:
+            self._gray = np.empty(frame.shape[:2], dtype=np.uint8)
+            self._prev_gray = np.empty_like(self._gray)
+            # There is no previous frame of this size to track from
+            self.since_detect = None
+        # Swap instead of copying: last frame's grey becomes the flow reference
+        self._gray, self._prev_gray = self._prev_gray, self._gray
+        cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray)
+
+    def _locate(self, frame):
+        """Update ``self._points``; returns ``"detect"``, ``"track"`` or None (no face)."""
+        import cv2
+
+        # Detection on every detect_every-th frame, tracking on the ones in between
+        if self.since_detect is not None and self.since_detect + 1 < self.detect_every:
+            tracked, status, _ = cv2.calcOpticalFlowPyrLK(
+                self._prev_gray, self._gray, self._points.reshape(-1, 1, 2), None, **FLOW_PARAMS
+            )
+            if status.mean() >= MIN_TRACKED:
+                self._points[:] = tracked.reshape(-1, 2)
+                self.since_detect += 1
+                return "track"
+
+        boxes = detect_faces(frame, self.detector)
+        if not boxes:
+            self.since_detect = None
+            return None
+        self._points[:] = landmark_points(self.predictor, frame, boxes[:1])[0]
+        self.since_detect = 0
+        return "detect"
+
+    def _push(self, scores, color):
+        self._scores[self._cursor] = scores
+        self._colors[self._cursor] = color
+        self._cursor = (self._cursor + 1) % self.window
+        self._filled = min(self._filled + 1, self.window)
+
+    def process(self, frame):
+        """Analyse one BGR frame; returns a result dict, or None when no face is visible."""
+        import cv2
+
+        self._to_gray(frame)
+        located = self._locate(frame)
+        self.frame_index += 1
+        if located is None:
+            # since_detect is already None, so the next frame re-detects
+            self.misses += 1
+            if self.misses >= self.max_misses:
+                self.reset()
+            return None
+        self.misses = 0
+
+        np.rint(self._points, out=self._int_points, casting="unsafe")
+        regions = region_polygons(self._int_points)
+        names = [name for name, polygons in regions.items() for _ in polygons]
+        samples = polygons_pixels(frame, [p for polygons in regions.values() for p in polygons])
+        bgr = {name: np.concatenate([s[::PIXEL_STRIDE] for n, s in zip(names, samples) if n == name])
+               for name in regions}
+        if len(bgr["skin"]) < 3:
+            return None
+
+        if self.illumination == "sclera":
+            gains = estimate_gains("sclera", eye_bgr=bgr["eyes"], skin_bgr=bgr["skin"])
+        else:
+            gains = estimate_gains(self.illumination, frame)
+        bgr = {name: apply_gains(pixels, gains) for name, pixels in bgr.items()}
+        lab = {name: bgr_to_lab(pixels) for name, pixels in bgr.items()}
+
+        features = dict(zip(FEATURE_NAMES, skin_features(lab["skin"]).tolist()))
+        summaries = {name: summarize(name, bgr[name], lab[name]) for name in bgr}
+        face_contrast = contrast(summaries)
+        x = self.classifier.vectorize(features, face_contrast and face_contrast["score"])
+        scores = self.classifier.score(x[None, :])[0]
+        dominant, _ = dominant_colors(convert_pixels(bgr["skin"], cv2.COLOR_BGR2HSV), k=3)
+        self._push(scores, dominant[0])
+
+        window_scores = self._scores[:self._filled].mean(axis=0)
+        return {
+            "frame": self.frame_index - 1,
+            "located": located,
+            "frame_season": self.classifier.seasons[int(scores.argmax())],
+            "season": self.classifier.seasons[int(window_scores.argmax())],
+            "scores": dict(zip(self.classifier.seasons, window_scores.round(4).tolist())),
+            "dominant_color": np.median(self._colors[:self._filled], axis=0).round().astype(int).tolist(),
+            "window": self._filled,
+            "landmarks": self._int_points,  # reused buffer, valid until the next frame
+        }
+
+
+def open_capture(source):
+    """A ``cv2.VideoCapture`` for a camera index (``"0"``) or a video file path."""
+    import cv2
+
+    capture = cv2.VideoCapture(int(source) if source.isdigit() else source)
+    if not capture.isOpened():
+        raise SystemExit(f"Cannot open video source {source!r}")
+    return capture
+
+
+def run(source, detect_every=DETECT_EVERY, window=WINDOW, output=None, max_frames=None, show=False,
+        log=sys.stderr):
+    import cv2
+
+    analyzer = StreamAnalyzer(detect_every, window)
+    capture = open_capture(source)
+    out = open(output, "w") if output else None
+    frame = None
+    frames = faces = 0
+    result = None
+    start = last_report = time.perf_counter()
+    try:
+        while max_frames is None or frames < max_frames:
+            # Decoding into the previous frame's array avoids a fresh allocation per frame
+            ok, frame = capture.read(frame)
+            if not ok:
+                break
+            frame_result = analyzer.process(frame)
+            frames += 1
+            if frame_result is not None:
+                result = frame_result
+                faces += 1
+                if out:
+                    out.write(json.dumps({k: v for k, v in result.items() if k != "landmarks"}) + "\n")
+                if show:
+                    for x, y in result["landmarks"]:
+                        cv2.circle(frame, (int(x), int(y)), 2, (0, 255, 0), -1)
+                    cv2.putText(frame, result["season"], (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+            if show:
+                cv2.imshow("skinsight", frame)
+                if cv2.waitKey(1) & 0xFF in (ord("q"), 27):
+                    break
+            now = time.perf_counter()
+            if now - last_report >= 2.0:
+                last_report = now
+                season = result["season"] if result else "-"
+                print(f"{frames} frames, {frames / (now - start):.1f} fps, season {season}", file=log)
+    finally:
+        capture.release()
+        if out:
+            out.close()
+        if show:
+            cv2.destroyAllWindows()
+
+    elapsed = time.perf_counter() - start
+    print(f"Done: {frames} frames ({faces} with a face) in {elapsed:.1f}s, "
+          f"{frames / elapsed if elapsed else 0:.1f} fps", file=log)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m skinsight.stream", description="Live color season analysis.")
+    parser.add_argument("source", help="camera index (e.g. 0) or video file")
+    parser.add_argument("--detect-every", type=int, default=DETECT_EVERY, help="frames between face detections")
+    parser.add_argument("--window", type=int, default=WINDOW, help="frames in the sliding season window")
+    parser.add_argument("-o", "--output", help="write every frame's result to this JSONL file")
+    parser.add_argument("--max-frames", type=int, help="stop after this many frames")
+    parser.add_argument("--show", action="store_true", help="show the frames with landmarks and season")
+    args = parser.parse_args(argv)
+    result = run(args.source, args.detect_every, args.window, args.output, args.max_frames, args.show)
+    if result:
+        print(json.dumps({k: v for k, v in result.items() if k != "landmarks"}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
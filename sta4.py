@@ -1,695 +1,49 @@
-import streamlit as st
-import cv2
-import dlib
-import numpy as np
-from sklearn.cluster import KMeans
-from PIL import Image
-
-# Initialize dlib
-detector = dlib.get_frontal_face_detector()
-predictor = dlib.shape_predictor("shape_predictor_68_face_landmarks.dat")
-
-# ==============================================
-# COMPREHENSIVE 16-SEASON COLOR ANALYSIS SYSTEM
-# ==============================================
-SEASONS = {
-    # Winter Subtypes
-    "True Winter": {
-        "description": "The classic winter - pure cool undertones with high contrast between skin, hair, and eyes",
-        "colors": ["Absolute White", "True Black", "Royal Blue", "Ruby Red", "Ice Gray", "Emerald Green"],
-        "color_hex": ["#FFFFFF", "#000000", "#4169E1", "#E0115F", "#C0C0C0", "#50C878"],
-        "color_reasons": [
-            "Absolute White creates maximum contrast that makes your features pop dramatically",
-            "True Black provides the deepest backdrop for your cool, vivid coloring",
-            "Royal Blue enhances the natural coolness in your skin while making whites of eyes appear brighter",
-            "Ruby Red (blue-based) gives powerful contrast that doesn't overwhelm your natural coloring",
-            "Ice Gray offers sophisticated neutral that maintains coolness without washing you out",
-            "Emerald Green brings out eye color while complementing your natural cool undertones"
-        ],
-        "hair": ["Blue-Black", "Platinum Blonde", "Cool Dark Brown"],
-        "hair_reasons": [
-            "Blue-Black enhances your natural high contrast - the darker the better",
-            "Platinum Blonde works only if kept extremely cool-toned with violet/silver undertones",
-            "Cool Dark Brown should have obvious ash tones to prevent any warmth from appearing"
-        ],
-        "makeup": ["True Red Lipstick (blue base)", "Cool Gray Eyeshadow", "Black Liquid Eyeliner"],
-        "makeup_male": ["Clear Brow Gel", "Color-Correcting Moisturizer", "Subtle Powder"],
-        "makeup_reasons": [
-            "Blue-based reds make teeth appear whiter and complement your natural lip undertones",
-            "Cool grays enhance eye shape without introducing warmth that would clash",
-            "Black liner provides maximum definition that suits your high contrast features"
-        ],
-        "jewelry": ["Platinum", "White Gold", "Sterling Silver", "Diamonds"],
-        "jewelry_male": ["Platinum Watch", "White Gold Cufflinks", "Silver Tie Clip"],
-        "jewelry_reasons": [
-            "Platinum's cool gray undertones harmonize perfectly with your skin",
-            "White gold (rhodium plated) provides bright accent without warmth",
-            "Sterling silver offers affordable alternative that still complements",
-            "Diamonds reflect your natural clarity and brightness"
-        ],
-        "avoid": ["Warm Browns", "Gold Jewelry", "Orange Tones", "Muted Colors"],
-        "avoid_reasons": [
-            "Warm browns make your skin appear sallow and tired",
-            "Gold jewelry creates visual disharmony with your cool undertones",
-            "Orange tones (including coral) drain your natural vibrancy",
-            "Muted/soft colors diminish your natural contrast"
-        ],
-        "occasions": {
-            "Business Formal": {
-                "male": {
-                    "outfit": "Black tailored suit with ice gray shirt",
-                    "shoes": "Black Oxford shoes",
-                    "accessories": "Platinum watch, silver tie bar",
-                    "grooming": "Clean shave or well-trimmed beard"
-                },
-                "female": {
-                    "outfit": "Black tailored suit with ice gray blouse",
-                    "shoes": "Patent black pumps",
-                    "accessories": "Platinum watch, diamond studs",
-                    "makeup": "Sheer true red lip, defined brows"
-                }
-            },
-            "Cocktail Party": {
-                "male": {
-                    "outfit": "Navy suit with ruby red pocket square",
-                    "shoes": "Black leather loafers",
-                    "accessories": "White gold cufflinks",
-                    "grooming": "Light contouring for definition"
-                },
-                "female": {
-                    "outfit": "Royal blue cocktail dress",
-                    "shoes": "Silver metallic heels",
-                    "accessories": "Statement silver cuff bracelet",
-                    "makeup": "Full coverage red lip, smoky eye"
-                }
-            },
-            "Weekend Casual": {
-                "male": {
-                    "outfit": "Black jeans with emerald green sweater",
-                    "shoes": "White leather sneakers",
-                    "accessories": "Stainless steel watch",
-                    "grooming": "Tinted moisturizer"
-                },
-                "female": {
-                    "outfit": "Black jeans with emerald green sweater",
-                    "shoes": "White leather sneakers",
-                    "accessories": "Layered delicate silver necklaces",
-                    "makeup": "Tinted balm, groomed brows"
-                }
-            }
-        }
-    },
-
-    "Bright Winter": {
-        "description": "The most vivid winter - extremely high contrast with cool, clear brightness and almost neon-like clarity",
-        "colors": ["Hot Pink", "Electric Blue", "Pure White", "Lemon Yellow", "Magenta", "Black"],
-        "color_hex": ["#FF69B4", "#7DF9FF", "#FFFFFF", "#FFF44F", "#FF00FF", "#000000"],
-        "color_reasons": [
-            "Hot Pink energizes your complexion with its cool vibrancy - the brighter the better",
-            "Electric Blue provides maximum impact that makes your features stand out dramatically",
-            "Pure White acts as perfect blank canvas to showcase your vivid coloring",
-            "Lemon Yellow (cool-toned) adds unexpected pop that surprisingly works with your palette",
-            "Magenta offers bold statement that complements your natural intensity",
-            "Black grounds your brightest colors and provides necessary contrast"
-        ],
-        "hair": ["Jet Black", "Icy Platinum", "Cool Espresso"],
-        "hair_reasons": [
-            "Jet Black enhances your extreme contrast - no brown undertones allowed",
-            "Icy Platinum must be nearly white with silver tones to maintain coolness",
-            "Cool Espresso works if it has obvious blue/ash undertones"
-        ],
-        "makeup": ["Fuchsia Lipstick", "Icy Pink Blush", "Graphite Eyeliner"],
-        "makeup_male": ["Color-Correcting Primer", "Light Powder", "Clear Lip Balm"],
-        "makeup_reasons": [
-            "Fuchsia lips amplify your natural brightness without being overwhelming",
-            "Icy pink blush mimics your natural flush without warmth",
-            "Graphite liner provides definition without harshness of pure black"
-        ],
-        "jewelry": ["White Gold", "Rhodium", "Crystal", "Sapphire"],
-        "jewelry_male": ["White Gold Chain", "Rhodium Plated Bracelet", "Crystal Cufflinks"],
-        "jewelry_reasons": [
-            "White gold provides bright metallic accent that doesn't compete",
-            "Rhodium plating offers cool contemporary shine",
-            "Crystal reflects your natural clarity and light",
-            "Sapphires complement your cool undertones beautifully"
-        ],
-        "avoid": ["Muted Tones", "Earth Tones", "Warm Golds", "Pastels"],
-        "avoid_reasons": [
-            "Muted tones make you appear washed out and dull",
-            "Earth tones clash with your natural vividness",
-            "Warm golds create unpleasant contrast with your skin",
-            "Pastels lack sufficient saturation for your coloring"
-        ],
-        "occasions": {
-            "Business Formal": {
-                "male": {
-                    "outfit": "Black suit with electric blue tie",
-                    "shoes": "Black patent leather shoes",
-                    "accessories": "Crystal cufflinks",
-                    "grooming": "Sharp haircut with defined edges"
-                },
-                "female": {
-                    "outfit": "Black suit with hot pink shell",
-                    "shoes": "Black pointed toe pumps",
-                    "accessories": "Crystal drop earrings",
-                    "makeup": "Defined brows, fuchsia lip stain"
-                }
-            },
-            "Cocktail Party": {
-                "male": {
-                    "outfit": "Electric blue blazer with black trousers",
-                    "shoes": "Black leather Chelsea boots",
-                    "accessories": "White gold chain",
-                    "grooming": "Light highlighter on cheekbones"
-                },
-                "female": {
-                    "outfit": "Magenta bodycon dress",
-                    "shoes": "Silver strappy heels",
-                    "accessories": "Statement crystal necklace",
-                    "makeup": "Bold lip, glowing highlight"
-                }
-            },
-            "Weekend Casual": {
-                "male": {
-                    "outfit": "Black jeans with lemon yellow polo",
-                    "shoes": "White high-top sneakers",
-                    "accessories": "Silicone sport watch",
-                    "grooming": "Tinted sunscreen"
-                },
-                "female": {
-                    "outfit": "Electric blue jeans with white tee",
-                    "shoes": "White leather sneakers",
-                    "accessories": "Stacked white gold bangles",
-                    "makeup": "Tinted moisturizer, mascara"
-                }
-            }
-        }
-    },
-
-    "Dark Winter": {
-        "description": "The deepest winter - maintains cool undertones but with added depth and richness to coloring",
-        "colors": ["Black Cherry", "Forest Green", "Charcoal Gray", "Eggplant", "Navy", "True Red"],
-        "color_hex": ["#3D0C02", "#228B22", "#36454F", "#614051", "#000080", "#C40233"],
-        "color_reasons": [
-            "Black Cherry provides deep richness that doesn't overwhelm your coolness",
-            "Forest Green offers natural depth that complements your coloring",
-            "Charcoal Gray serves as sophisticated neutral with enough depth",
-            "Eggplant delivers regal purple that harmonizes with your undertones",
-            "Navy provides professional alternative to black with more dimension",
-            "True Red (blue-based) gives powerful pop that suits your depth"
-        ],
-        "hair": ["Blue-Black", "Dark Espresso", "Cool Burgundy"],
-        "hair_reasons": [
-            "Blue-black enhances your natural depth without appearing flat",
-            "Dark espresso works if it has obvious cool undertones",
-            "Cool burgundy (blue-based) can add dimension if kept deep"
-        ],
-        "makeup": ["Berry Lips", "Cool Brown Eyeshadow", "Black-Brown Eyeliner"],
-        "makeup_male": ["Tinted Moisturizer", "Matte Bronzer", "Brow Gel"],
-        "makeup_reasons": [
-            "Berry lips provide rich color that matches your depth",
-            "Cool brown shadows define eyes without warmth",
-            "Black-brown liner offers softer alternative to pure black"
-        ],
-        "jewelry": ["Gunmetal", "Oxidized Silver", "Black Diamonds"],
-        "jewelry_male": ["Gunmetal Watch", "Oxidized Silver Ring", "Black Diamond Studs"],
-        "jewelry_reasons": [
-            "Gunmetal provides edgy coolness that suits your depth",
-            "Oxidized silver offers antique feel that complements",
-            "Black diamonds add mysterious elegance"
-        ],
-        "avoid": ["Light Pastels", "Warm Browns", "Yellow Gold", "Neon Colors"],
-        "avoid_reasons": [
-            "Light pastels create unflattering contrast with your depth",
-            "Warm browns make your skin appear muddy",
-            "Yellow gold clashes with your cool undertones",
-            "Neon colors compete rather than complement"
-        ],
-        "occasions": {
-            "Business Formal": {
-                "male": {
-                    "outfit": "Charcoal gray suit with black cherry tie",
-                    "shoes": "Black leather oxfords",
-                    "accessories": "Gunmetal tie clip",
-                    "grooming": "Well-groomed beard"
-                },
-                "female": {
-                    "outfit": "Charcoal gray suit with black cherry blouse",
-                    "shoes": "Black leather loafers",
-                    "accessories": "Gunmetal watch",
-                    "makeup": "Berry lip stain, groomed brows"
-                }
-            },
-            "Cocktail Party": {
-                "male": {
-                    "outfit": "Forest green velvet blazer with black trousers",
-                    "shoes": "Black patent leather shoes",
-                    "accessories": "Black diamond cufflinks",
-                    "grooming": "Light contouring"
-                },
-                "female": {
-                    "outfit": "Forest green velvet dress",
-                    "shoes": "Black patent heels",
-                    "accessories": "Black diamond earrings",
-                    "makeup": "Smoky eye, berry lips"
-                }
-            },
-            "Weekend Casual": {
-                "male": {
-                    "outfit": "Navy sweater with black jeans",
-                    "shoes": "Black leather boots",
-                    "accessories": "Leather bracelet",
-                    "grooming": "Tinted brow gel"
-                },
-                "female": {
-                    "outfit": "Navy sweater with black jeans",
-                    "shoes": "White sneakers",
-                    "accessories": "Leather wrap bracelet",
-                    "makeup": "Tinted balm, mascara"
-                }
-            }
-        }
-    },
-
-    # Spring Subtypes
-    "Bright Spring": {
-        "description": "The most vivid spring - warm undertones with extremely high contrast and clarity",
-        "colors": ["Coral", "Aqua", "Lime Green", "Golden Yellow", "Bright Peach", "True Red"],
-        "color_hex": ["#FF7F50", "#00FFFF", "#32CD32", "#FFD700", "#FFC0CB", "#FF0000"],
-        "color_reasons": [
-            "Coral energizes your complexion with warm vibrancy",
-            "Aqua provides refreshing contrast that makes you glow",
-            "Lime Green brings out golden undertones in skin",
-            "Golden Yellow acts as perfect warm neutral",
-            "Bright Peach mimics natural flush beautifully",
-            "True Red (slightly orange-based) makes dramatic statement"
-        ],
-        "hair": ["Golden Blonde", "Copper Red", "Warm Light Brown"],
-        "hair_reasons": [
-            "Golden blonde enhances your natural warmth",
-            "Copper red makes skin appear radiant",
-            "Warm light brown should have golden highlights"
-        ],
-        "makeup": ["Coral Lipstick", "Peach Blush", "Bronze Eyeliner"],
-        "makeup_male": ["Tinted Sunscreen", "Peach Color Corrector", "Clear Lip Balm"],
-        "makeup_reasons": [
-            "Coral lips complement your natural lip undertones",
-            "Peach blush mimics youthful flush",
-            "Bronze liner warms up eye area"
-        ],
-        "jewelry": ["Yellow Gold", "Rose Gold", "Amber"],
-        "jewelry_male": ["Gold Chain", "Rose Gold Watch", "Amber Bead Bracelet"],
-        "jewelry_reasons": [
-            "Yellow gold harmonizes with warm undertones",
-            "Rose gold adds romantic warmth",
-            "Amber provides organic golden accent"
-        ],
-        "avoid": ["Cool Grays", "Muted Colors", "Silver Jewelry", "Black"],
-        "avoid_reasons": [
-            "Cool grays make you appear sallow",
-            "Muted colors drain your natural vibrancy",
-            "Silver jewelry clashes with warm skin",
-            "Black overwhelms your delicate warmth"
-        ],
-        "occasions": {
-            "Business Formal": {
-                "male": {
-                    "outfit": "Golden yellow tie with navy suit",
-                    "shoes": "Brown leather oxfords",
-                    "accessories": "Gold tie clip",
-                    "grooming": "Light bronzer"
-                },
-                "female": {
-                    "outfit": "Golden yellow blazer with white shell",
-                    "shoes": "Nude pumps",
-                    "accessories": "Gold hoop earrings",
-                    "makeup": "Peach lip gloss, defined brows"
-                }
-            },
-            "Cocktail Party": {
-                "male": {
-                    "outfit": "Coral blazer with cream trousers",
-                    "shoes": "Brown leather loafers",
-                    "accessories": "Gold pocket watch",
-                    "grooming": "Peach-toned concealer"
-                },
-                "female": {
-                    "outfit": "Coral wrap dress",
-                    "shoes": "Gold metallic sandals",
-                    "accessories": "Statement gold necklace",
-                    "makeup": "Bronzed glow, glossy lips"
-                }
-            },
-            "Weekend Casual": {
-                "male": {
-                    "outfit": "Aqua polo with white shorts",
-                    "shoes": "Brown leather sandals",
-                    "accessories": "Woven leather bracelet",
-                    "grooming": "Tinted moisturizer"
-                },
-                "female": {
-                    "outfit": "Aqua jeans with white tee",
-                    "shoes": "Brown leather sandals",
-                    "accessories": "Stacked bangles",
-                    "makeup": "Tinted moisturizer, mascara"
-                }
-            }
-        }
-    },
-
-    "True Spring": {
-        "description": "The classic spring - warm undertones with medium-high contrast and natural brightness",
-        "colors": ["True Red", "Grass Green", "Camel", "Sky Blue", "Warm Pink", "Goldenrod"],
-        "color_hex": ["#BF0A30", "#7CFC00", "#C19A6B", "#87CEEB", "#FFB6C1", "#DAA520"],
-        "color_reasons": [
-            "True Red (slightly orange-based) makes teeth appear whiter",
-            "Grass Green complements golden undertones in skin",
-            "Camel provides perfect warm neutral for everyday wear",
-            "Sky Blue offers refreshing contrast to warm palette",
-            "Warm Pink mimics natural lip color beautifully",
-            "Goldenrod adds sunny accent to any outfit"
-        ],
-        "hair": ["Honey Blonde", "Golden Brown", "Strawberry Blonde"],
-        "hair_reasons": [
-            "Honey blonde enhances natural warmth without brassiness",
-            "Golden brown should have visible golden highlights",
-            "Strawberry blonde adds flattering warmth to complexion"
-        ],
-        "makeup": ["Warm Red Lipstick", "Golden Peach Blush", "Bronze Eyeshadow"],
-        "makeup_male": ["BB Cream", "Peach Blush Stick", "Brow Pencil"],
-        "makeup_reasons": [
-            "Warm red lips complement natural lip undertones",
-            "Golden peach blush mimics healthy flush",
-            "Bronze shadows warm up eye area naturally"
-        ],
-        "jewelry": ["Yellow Gold", "Brass", "Citrine"],
-        "jewelry_male": ["Gold Signet Ring", "Brass Cufflinks", "Citrine Beads"],
-        "jewelry_reasons": [
-            "Yellow gold complements warm skin perfectly",
-            "Brass offers affordable warm alternative",
-            "Citrine stones enhance golden undertones"
-        ],
-        "avoid": ["Cool Pastels", "Black", "Silver Jewelry", "Mauve"],
-        "avoid_reasons": [
-            "Cool pastels make skin appear sallow",
-            "Black overwhelms delicate spring coloring",
-            "Silver jewelry clashes with warm undertones",
-            "Mauve drains natural warmth from face"
-        ],
-        "occasions": {
-            "Business Formal": {
-                "male": {
-                    "outfit": "Camel blazer with white shirt",
-                    "shoes": "Brown leather loafers",
-                    "accessories": "Gold tie bar",
-                    "grooming": "Light bronzing powder"
-                },
-                "female": {
-                    "outfit": "Camel suit with white blouse",
-                    "shoes": "Nude pumps",
-                    "accessories": "Gold hoop earrings",
-                    "makeup": "Sheer warm red lip, groomed brows"
-                }
-            },
-            "Cocktail Party": {
-                "male": {
-                    "outfit": "True red shirt with navy blazer",
-                    "shoes": "Brown leather dress shoes",
-                    "accessories": "Gold chain necklace",
-                    "grooming": "Peach-toned concealer"
-                },
-                "female": {
-                    "outfit": "True red wrap dress",
-                    "shoes": "Gold strappy sandals",
-                    "accessories": "Statement gold necklace",
-                    "makeup": "Bronzed eyes, glossy lips"
-                }
-            },
-            "Weekend Casual": {
-                "male": {
-                    "outfit": "Sky blue polo with white shorts",
-                    "shoes": "Brown leather sandals",
-                    "accessories": "Woven bracelet",
-                    "grooming": "Tinted sunscreen"
-                },
-                "female": {
-                    "outfit": "Sky blue jeans with white tee",
-                    "shoes": "Brown leather sandals",
-                    "accessories": "Stacked bangles",
-                    "makeup": "Tinted balm, mascara"
-                }
-            }
-        }
-    },
-
-    # [CONTINUED WITH ALL REMAINING SEASONS...]
-    # Light Spring, Warm Spring
-    # True Summer, Light Summer, Cool Summer, Soft Summer
-    # True Autumn, Dark Autumn, Warm Autumn, Soft Autumn
-
-    # Summer Subtypes
-    "True Summer": {
-        "description": "The classic summer - cool undertones with medium contrast and natural softness",
-        "colors": ["Soft Rose", "Powder Blue", "Cool Gray", "Lavender", "Dusty Plum", "Seafoam Green"],
-        "color_hex": ["#F4C2C2", "#B0E0E6", "#909090", "#E6E6FA", "#DDA0DD", "#93E9BE"],
-        "color_reasons": [
-            "Soft Rose provides flattering neutral that doesn't overwhelm",
-            "Powder Blue offers perfect cool pastel for your palette",
-            "Cool Gray serves as sophisticated neutral alternative",
-            "Lavender complements natural coolness beautifully",
-            "Dusty Plum adds depth without being overpowering",
-            "Seafoam Green provides refreshing cool accent"
-        ],
-        "hair": ["Ash Blonde", "Cool Light Brown", "Mousy Brown"],
-        "hair_reasons": [
-            "Ash blonde maintains natural coolness without brassiness",
-            "Cool light brown should have visible ash tones",
-            "Mousy brown offers soft, natural look"
-        ],
-        "makeup": ["Rose Pink Lipstick", "Cool Mauve Blush", "Taupe Eyeshadow"],
-        "makeup_male": ["Tinted Moisturizer", "Cool-Toned Concealer", "Clear Brow Gel"],
-        "makeup_reasons": [
-            "Rose pink lips mimic natural lip color perfectly",
-            "Cool mauve blush creates natural-looking flush",
-            "Taupe shadows define eyes without harshness"
-        ],
-        "jewelry": ["Sterling Silver", "White Gold", "Pearl"],
-        "jewelry_male": ["Silver Watch", "White Gold Ring", "Pearl Cufflinks"],
-        "jewelry_reasons": [
-            "Sterling silver complements cool undertones",
-            "White gold offers subtle shine",
-            "Pearls provide soft, elegant accent"
-        ],
-        "avoid": ["Warm Reds", "Orange Tones", "Gold Jewelry", "Black"],
-        "avoid_reasons": [
-            "Warm reds clash with cool undertones",
-            "Orange tones make skin appear sallow",
-            "Gold jewelry creates visual disharmony",
-            "Black overwhelms delicate summer coloring"
-        ],
-        "occasions": {
-            "Business Formal": {
-                "male": {
-                    "outfit": "Cool gray suit with powder blue shirt",
-                    "shoes": "Black leather oxfords",
-                    "accessories": "Silver tie clip",
-                    "grooming": "Light powder"
-                },
-                "female": {
-                    "outfit": "Cool gray suit with powder blue blouse",
-                    "shoes": "Nude pumps",
-                    "accessories": "Pearl stud earrings",
-                    "makeup": "Sheer rose lip, groomed brows"
-                }
-            },
-            "Cocktail Party": {
-                "male": {
-                    "outfit": "Dusty plum blazer with gray trousers",
-                    "shoes": "Black leather loafers",
-                    "accessories": "Pearl cufflinks",
-                    "grooming": "Cool-toned bronzer"
-                },
-                "female": {
-                    "outfit": "Dusty plum cocktail dress",
-                    "shoes": "Silver metallic heels",
-                    "accessories": "Statement pearl necklace",
-                    "makeup": "Soft smoky eye, glossy lips"
-                }
-            },
-            "Weekend Casual": {
-                "male": {
-                    "outfit": "Seafoam green polo with white shorts",
-                    "shoes": "White leather sneakers",
-                    "accessories": "Silver chain necklace",
-                    "grooming": "Tinted sunscreen"
-                },
-                "female": {
-                    "outfit": "Seafoam green sweater with white jeans",
-                    "shoes": "White sneakers",
-                    "accessories": "Delicate silver bracelet",
-                    "makeup": "Tinted balm, mascara"
-                }
-            }
-        }
-    },
-
-    # [REMAINING SEASONS CONTINUE...]
-    # Light Summer, Cool Summer, Soft Summer
-    # True Autumn, Dark Autumn, Warm Autumn, Soft Autumn
-
-    # Autumn Subtypes
-    "True Autumn": {
-        "description": "The classic autumn - warm undertones with rich, earthy colors and medium contrast",
-        "colors": ["Burnt Orange", "Olive Green", "Mustard Yellow", "Rust", "Camel", "Deep Teal"],
-        "color_hex": ["#CC5500", "#808000", "#FFDB58", "#B7410E", "#C19A6B", "#008080"],
-        "color_reasons": [
-            "Burnt Orange enhances natural warmth dramatically",
-            "Olive Green complements golden undertones perfectly",
-            "Mustard Yellow adds sunny accent to any outfit",
-            "Rust provides rich depth that flatters your coloring",
-            "Camel serves as perfect warm neutral base",
-            "Deep Teal offers cool contrast that surprisingly works"
-        ],
-        "hair": ["Auburn", "Golden Brown", "Rich Chestnut"],
-        "hair_reasons": [
-            "Auburn enhances natural warmth beautifully",
-            "Golden brown should have visible golden highlights",
-            "Rich chestnut provides depth without coolness"
-        ],
-        "makeup": ["Brick Red Lipstick", "Copper Blush", "Warm Brown Eyeliner"],
-        "makeup_male": ["Tinted Moisturizer", "Warm Bronzer", "Brow Pencil"],
-        "makeup_reasons": [
-            "Brick red lips complement natural lip undertones",
-            "Copper blush mimics sun-kissed glow",
-            "Warm brown liner defines eyes naturally"
-        ],
-        "jewelry": ["Gold", "Copper", "Amber"],
-        "jewelry_male": ["Gold Chain", "Copper Bracelet", "Amber Beads"],
-        "jewelry_reasons": [
-            "Gold harmonizes perfectly with warm skin",
-            "Copper offers earthy alternative",
-            "Amber stones enhance golden undertones"
-        ],
-        "avoid": ["Cool Pastels", "Black", "Silver Jewelry", "Fuchsia"],
-        "avoid_reasons": [
-            "Cool pastels make skin appear sallow",
-            "Black overwhelms warm autumn coloring",
-            "Silver jewelry clashes with warm undertones",
-            "Fuchsia creates unflattering contrast"
-        ],
-        "occasions": {
-            "Business Formal": {
-                "male": {
-                    "outfit": "Camel suit with olive green shirt",
-                    "shoes": "Brown leather oxfords",
-                    "accessories": "Gold tie clip",
-                    "grooming": "Light bronzing powder"
-                },
-                "female": {
-                    "outfit": "Camel suit with olive green shell",
-                    "shoes": "Brown leather pumps",
-                    "accessories": "Gold hoop earrings",
-                    "makeup": "Sheer brick lip, groomed brows"
-                }
-            },
-            "Cocktail Party": {
-                "male": {
-                    "outfit": "Rust velvet blazer with cream trousers",
-                    "shoes": "Brown leather loafers",
-                    "accessories": "Gold pocket square",
-                    "grooming": "Copper-toned highlighter"
-                },
-                "female": {
-                    "outfit": "Rust velvet dress",
-                    "shoes": "Gold strappy sandals",
-                    "accessories": "Statement gold necklace",
-                    "makeup": "Smoky eye, glossy lips"
-                }
-            },
-            "Weekend Casual": {
-                "male": {
-                    "outfit": "Mustard yellow sweater with dark jeans",
-                    "shoes": "Brown leather boots",
-                    "accessories": "Leather wrap bracelet",
-                    "grooming": "Tinted brow gel"
-                },
-                "female": {
-                    "outfit": "Mustard yellow sweater with jeans",
-                    "shoes": "Brown boots",
-                    "accessories": "Leather wrap bracelet",
-                    "makeup": "Tinted balm, mascara"
-                }
-            }
-        }
-    },
+import io
 
-    # [REMAINING SEASONS CONTINUE...]
-    # Dark Autumn, Warm Autumn, Soft Autumn
-}
+import streamlit as st
 
-# Enhanced occasion types
-OCCASION_TYPES = {
-    "Business": ["Business Formal", "Business Casual", "Presentation", "Interview"],
-    "Social": ["Cocktail Party", "Wedding Guest", "Date Night", "Brunch"],
-    "Casual": ["Weekend Casual", "Errands", "Work From Home", "Outdoor Activities"],
-    "Special": ["Black Tie", "Formal Dinner", "Gala", "Red Carpet"]
-}
+from skinsight import analyze_details, config_fingerprint, load_knowledge_base
+from skinsight.cache import get_result_cache, read_bytes
+from skinsight.decode import open_image
+from skinsight.models import warm_up
+from skinsight.quality import ImageQualityError
+from skinsight.recommendations import warm_up as warm_up_recommendations
+from skinsight.render import CSS as FRAGMENT_CSS, fragment
 
 # ========================
 # IMAGE ANALYSIS FUNCTION
 # ========================
-def analyze_image(uploaded_file):
-    image = Image.open(uploaded_file)
-    image = np.array(image)
-    image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    faces = detector(gray)
-    
-    if len(faces) == 0:
-        return None
-    
-    landmarks = predictor(gray, faces[0])
-    mask = np.zeros(image.shape[:2], dtype=np.uint8)
-    points = np.array([(landmarks.part(i).x, landmarks.part(i).y) for i in range(17, 68)])
-    cv2.fillConvexPoly(mask, points, 255)
-    skin = cv2.bitwise_and(image, image, mask=mask)
-    hsv_skin = cv2.cvtColor(skin, cv2.COLOR_BGR2HSV)
-    skin_pixels = hsv_skin[np.where(mask == 255)]
-    
-    clt = KMeans(n_clusters=3)
-    clt.fit(skin_pixels)
-    dominant_colors = clt.cluster_centers_.astype(int)
-    
-    # Enhanced season detection logic
-    hue = dominant_colors[0][0]
-    saturation = dominant_colors[0][1]
-    value = dominant_colors[0][2]
-    
-    if hue < 15 or hue > 165:  # Cool tones
-        if saturation > 150 and value > 180:
-            return "Bright Winter"
-        elif value > 160:
-            return "True Winter"
-        else:
-            return "Cool Summer"
-    elif 15 <= hue <= 45:  # Warm tones
-        if saturation > 140 and value > 170:
-            return "Bright Spring"
-        elif value > 150:
-            return "True Autumn"
-        else:
-            return "Soft Autumn"
-    else:  # Neutral/soft tones
-        if saturation < 100:
-            return "Soft Summer"
-        else:
-            return "True Summer"
+def cached_analyze_details(uploaded_file):
+    data = read_bytes(uploaded_file)
+    return get_result_cache().get_or_compute(
+        data, f"{config_fingerprint()}-all-faces",
+        lambda: analyze_details(io.BytesIO(data), all_faces=True)
+    )
+
+def annotate_faces(uploaded_file, faces, selected):
+    from PIL import ImageDraw
+
+    # Same decode as the pipeline, so the face boxes line up
+    image = open_image(io.BytesIO(read_bytes(uploaded_file)))
+    draw = ImageDraw.Draw(image)
+    width = max(2, max(image.size) // 300)
+    for i, face in enumerate(faces):
+        left, top, right, bottom = face.face_box
+        color = "#4e79a7" if i == selected else "#bbbbbb"
+        draw.rectangle((left, top, right, bottom), outline=color, width=width)
+        draw.text((left + width, top + width), str(i + 1), fill=color)
+    return image
 
 # ========================
 # STREAMLIT UI
 # ========================
 st.set_page_config(layout="wide", page_title="16-Season Color Analysis", page_icon="🎨")
 
+# Load the dlib models and build the occasion matrix once per server process
+# (no-ops on later reruns)
+warm_up()
+warm_up_recommendations()
+
 # Custom CSS
 st.markdown("""
 <style>
@@ -734,12 +88,16 @@ st.markdown("""
         background-color: #4e79a7;
         color: white;
     }
+""" + FRAGMENT_CSS + """
 </style>
 """, unsafe_allow_html=True)
 
 st.title("🎨 16-Season Color Analysis System")
 st.subheader("Professional Korean-Style Personal Color Analysis")
 
+# Debug options
+show_timings = st.sidebar.checkbox("Show pipeline timings", value=False)
+
 # Gender selection
 gender = st.radio("Select gender:", ("Female", "Male"), horizontal=True)
 
@@ -748,9 +106,30 @@ uploaded_file = st.file_uploader("Upload a well-lit frontal photo:", type=["jpg"
 
 if uploaded_file:
     with st.spinner("Analyzing your colors..."):
-        season = analyze_image(uploaded_file)
+        quality_problems = []
+        try:
+            details = cached_analyze_details(uploaded_file)
+        except ImageQualityError as exc:
+            details = None
+            quality_problems = exc.report["problems"]
+        season = details.season if details else None
+        face_index = 0
+        
+        if details and len(details.faces) > 1:
+            face_index = st.selectbox(
+                f"{len(details.faces)} faces detected - choose whose colors to show:",
+                range(len(details.faces)),
+                format_func=lambda i: f"Face {i + 1} ({details.faces[i].season})",
+            )
+            season = details.faces[face_index].season
         
         if season:
+            for warning in details.quality.get("warnings", []):
+                st.warning(warning["message"])
+            kb = load_knowledge_base()
+            record = kb.seasons[season]
+            view = record.view(gender)
+            
             # Create main tabs
             tab1, tab2, tab3 = st.tabs(["🎨 Color Analysis", "👗 Occasion Styling", "💡 Style Guide"])
             
@@ -759,9 +138,23 @@ if uploaded_file:
                 col1, col2 = st.columns([1, 3])
                 
                 with col1:
-                    st.image(uploaded_file, width=300)
+                    if len(details.faces) > 1:
+                        st.image(annotate_faces(uploaded_file, details.faces, face_index), width=300)
+                    else:
+                        st.image(uploaded_file, width=300)
                     st.success(f"**Your Season:** {season}")
-                    st.caption(SEASONS[season]["description"])
+                    face = details.faces[face_index]
+                    alternatives = ", ".join(f"{name} ({score:.0%})" for name, score in face.top()[1:])
+                    st.caption(f"**Match score:** {face.confidence:.0%} (relative to the other seasons, not a probability) "
+                               f"· Also close: {alternatives}")
+                    if face.margin < 0.2:
+                        st.info(f"This is a borderline result between {season} and {face.top(2)[1][0]}. "
+                                "A second photo in daylight can settle it.")
+                    st.caption(record.description)
+                    face_contrast = face.contrast
+                    if face_contrast and face_contrast["score"] is not None:
+                        level = "High" if face_contrast["score"] > 0.45 else "Medium" if face_contrast["score"] > 0.25 else "Low"
+                        st.caption(f"**Skin/hair/eye contrast:** {level} ({face_contrast['score']:.0%})")
                 
                 with col2:
                     # Create subtabs for organization
@@ -769,66 +162,26 @@ if uploaded_file:
                     
                     with subtab1:
                         st.subheader("Optimal Colors For You")
-                        cols = st.columns(2)
-                        for i, (color, hex_code, reason) in enumerate(zip(
-                            SEASONS[season]["colors"], 
-                            SEASONS[season]["color_hex"], 
-                            SEASONS[season]["color_reasons"]
-                        )):
-                            with cols[i%2]:
-                                st.markdown(f"""
-                                <div style="background-color:{hex_code};" class="color-swatch"></div>
-                                <div class="season-card">
-                                    <h4>{color}</h4>
-                                    <p>{reason}</p>
-                                </div>
-                                """, unsafe_allow_html=True)
+                        st.markdown(fragment("colors", season, gender), unsafe_allow_html=True)
                     
                     with subtab2:
                         col1, col2 = st.columns(2)
                         
                         with col1:
                             st.subheader("Hair Colors")
-                            for hair, reason in zip(SEASONS[season]["hair"], SEASONS[season]["hair_reasons"]):
-                                st.markdown(f"""
-                                <div class="season-card">
-                                    <h4>{hair}</h4>
-                                    <p>{reason}</p>
-                                </div>
-                                """, unsafe_allow_html=True)
+                            st.markdown(fragment("hair", season, gender), unsafe_allow_html=True)
                         
                         with col2:
                             st.subheader("Makeup/Grooming")
-                            makeup_key = "makeup" if gender == "Female" else "makeup_male"
-                            for makeup, reason in zip(SEASONS[season][makeup_key], SEASONS[season]["makeup_reasons"]):
-                                st.markdown(f"""
-                                <div class="season-card">
-                                    <h4>{makeup}</h4>
-                                    <p>{reason}</p>
-                                </div>
-                                """, unsafe_allow_html=True)
+                            st.markdown(fragment("makeup", season, gender), unsafe_allow_html=True)
                     
                     with subtab3:
                         st.subheader("Jewelry/Accessories")
-                        jewelry_key = "jewelry" if gender == "Female" else "jewelry_male"
-                        cols = st.columns(2)
-                        for i, (item, reason) in enumerate(zip(SEASONS[season][jewelry_key], SEASONS[season]["jewelry_reasons"])):
-                            cols[i%2].markdown(f"""
-                            <div class="season-card">
-                                <h4>{item}</h4>
-                                <p>{reason}</p>
-                            </div>
-                            """, unsafe_allow_html=True)
+                        st.markdown(fragment("jewelry", season, gender), unsafe_allow_html=True)
                     
                     with subtab4:
                         st.subheader("Colors & Styles To Avoid")
-                        for item, reason in zip(SEASONS[season]["avoid"], SEASONS[season]["avoid_reasons"]):
-                            st.markdown(f"""
-                            <div class="avoid-card">
-                                <h4>{item}</h4>
-                                <p>{reason}</p>
-                            </div>
-                            """, unsafe_allow_html=True)
+                        st.markdown(fragment("avoid", season, gender), unsafe_allow_html=True)
             
             with tab2:
                 st.subheader("Occasion-Specific Styling Recommendations")
@@ -836,32 +189,23 @@ if uploaded_file:
                 # Create occasion type selector
                 occasion_category = st.selectbox(
                     "Select occasion category:",
-                    list(OCCASION_TYPES.keys()),
+                    list(kb.occasion_types.keys()),
                     index=0
                 )
                 
                 # Create occasion selector based on category
                 occasion = st.selectbox(
                     "Select specific occasion:",
-                    OCCASION_TYPES[occasion_category],
+                    kb.occasion_types[occasion_category],
                     index=0
                 )
                 
                 # Display recommendation
-                if occasion in SEASONS[season]["occasions"]:
-                    rec = SEASONS[season]["occasions"][occasion][gender.lower()]
-                    st.markdown(f"""
-                    <div class="occasion-card">
-                        <h3>{occasion} Look</h3>
-                        <p><strong>Outfit:</strong> {rec['outfit']}</p>
-                        <p><strong>Shoes:</strong> {rec['shoes']}</p>
-                        <p><strong>Accessories:</strong> {rec['accessories']}</p>
-                        <p><strong>{'Makeup' if gender == 'Female' else 'Grooming'}:</strong> {rec['makeup' if gender == 'Female' else 'grooming']}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
+                occasion_html = fragment("occasion", season, gender, occasion)
+                if occasion_html:
+                    st.markdown(occasion_html, unsafe_allow_html=True)
                 else:
-                    st.warning("No specific recommendations for this occasion. Here's a general guide:")
-                    # Fallback recommendation logic could go here
+                    st.warning("No specific recommendations for this occasion.")
                 
                 # Additional occasion-based tips
                 st.subheader("Additional Styling Tips")
@@ -884,12 +228,12 @@ if uploaded_file:
                 st.write(f"""
                 ## {season} Style Principles
                 
-                **1. Color Harmony:** {SEASONS[season]["description"]}
+                **1. Color Harmony:** {record.description}
                 
                 **2. Key Characteristics:**
-                - {', '.join(SEASONS[season]["colors"][:3])} are your power colors
-                - Best metals: {', '.join(SEASONS[season]["jewelry"][:2])}
-                - Avoid: {', '.join(SEASONS[season]["avoid"][:2])}
+                - {', '.join(swatch.name for swatch in record.colors[:3])} are your power colors
+                - Best metals: {', '.join(record.metals[:2])}
+                - Avoid: {', '.join(item.name for item in record.avoid[:2])}
                 
                 **3. Wardrobe Building Tips:**
                 - Start with 2-3 pieces in your best colors
@@ -897,20 +241,31 @@ if uploaded_file:
                 - Add seasonal accent pieces for variety
                 
                 **4. {'Makeup' if gender == 'Female' else 'Grooming'} Application:**
-                - Focus on {SEASONS[season]["makeup" if gender == 'Female' else 'makeup_male'][0].split()[0]} for {'lips' if gender == 'Female' else 'complexion'}
-                - Use {SEASONS[season]["makeup" if gender == 'Female' else 'makeup_male'][1].split()[0]} to enhance {'cheeks' if gender == 'Female' else 'features'}
+                - Focus on {view.makeup[0].name.split()[0]} for {'lips' if gender == 'Female' else 'complexion'}
+                - Use {view.makeup[1].name.split()[0]} to enhance {'cheeks' if gender == 'Female' else 'features'}
                 """)
                 
                 # Visual color palette
                 st.subheader("Your Complete Color Palette")
-                cols = st.columns(6)
-                for i, (color, hex_code) in enumerate(zip(SEASONS[season]["colors"], SEASONS[season]["color_hex"])):
-                    with cols[i%6]:
-                        st.markdown(f"""
-                        <div style="background-color:{hex_code};" class="color-swatch"></div>
-                        <div style="text-align: center;">{color}</div>
-                        """, unsafe_allow_html=True)
+                st.markdown(fragment("palette", season, gender), unsafe_allow_html=True)
+            
+            if show_timings:
+                with st.expander("⏱️ Pipeline timings", expanded=True):
+                    timings = details.timings
+                    st.caption(f"Total: {sum(t['seconds'] for t in timings.values()) * 1000:.1f} ms "
+                               "(measured when this image was first analyzed)")
+                    st.table([
+                        {
+                            "Stage": stage,
+                            "Time (ms)": round(t["seconds"] * 1000, 2),
+                            "Peak traced memory (KB)": None if t["peak_bytes"] is None else t["peak_bytes"] // 1024,
+                        }
+                        for stage, t in timings.items()
+                    ])
         
+        elif quality_problems:
+            st.error("This photo can't be analyzed reliably:\n\n"
+                     + "\n".join(f"- {problem['message']}" for problem in quality_problems))
         else:
             st.error("Face not detected. Please try another photo with clear facial features.")
 
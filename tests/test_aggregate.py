@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from skinsight.aggregate import SkinStats
+from skinsight.features import FEATURE_NAMES, skin_features
+
+
+def _lab(n, L, seed):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.normal(L, 6, n).clip(0, 100), rng.normal(14, 3, n), rng.normal(20, 4, n)])
+
+
+def _merge(parts, contrasts=None):
+    merged = SkinStats()
+    for lab, contrast in zip(parts, contrasts or [None] * len(parts)):
+        merged.merge(SkinStats.from_lab(lab, contrast))
+    return merged
+
+
+def test_merged_stats_match_the_pooled_pixels():
+    parts = [_lab(400, 55, 0), _lab(1500, 70, 1), _lab(90, 62, 2)]
+    features = _merge(parts).features()
+    expected = dict(zip(FEATURE_NAMES, skin_features(np.concatenate(parts))))
+    for name in FEATURE_NAMES:
+        # Percentiles come from the 0.25 L* histogram, everything else is exact
+        tolerance = 0.25 if name in ("L_p10", "L_p90") else 1e-3
+        assert features[name] == pytest.approx(expected[name], abs=tolerance), name
+
+
+def test_merge_order_does_not_matter():
+    parts = [_lab(300, 50, 3), _lab(800, 75, 4), _lab(50, 60, 5)]
+    forward = _merge(parts, [0.2, 0.6, 0.4])
+    backward = _merge(parts[::-1], [0.4, 0.6, 0.2])
+    assert forward.features() == pytest.approx(backward.features(), abs=1e-9)
+    assert forward.contrast == pytest.approx(backward.contrast)
+    assert forward.contrast == pytest.approx((0.2 * 300 + 0.6 * 800 + 0.4 * 50) / 1150)
+
+
+def test_scaled_stats_weight_every_photo_equally():
+    close_up, distant = _lab(5000, 70, 6), _lab(50, 50, 7)
+    merged = SkinStats()
+    for lab, contrast in ((close_up, 0.8), (distant, 0.2)):
+        merged.merge(SkinStats.from_lab(lab, contrast).scaled())
+    assert merged.count == 2
+    assert merged.mean == pytest.approx((close_up.mean(axis=0) + distant.mean(axis=0)) / 2)
+    assert merged.contrast == pytest.approx(0.5)
+    # The median falls between the two photos instead of inside the close-up
+    assert close_up[:, 0].mean() > merged.percentile(50) > distant[:, 0].mean()
+
+
+def test_empty_stats_merge_as_a_no_op():
+    stats = SkinStats.from_lab(_lab(100, 60, 8))
+    before = stats.features()
+    stats.merge(SkinStats()).merge(SkinStats.from_lab(np.empty((0, 3))).scaled())
+    assert stats.features() == before
@@ -0,0 +1,115 @@
+import io
+import json
+import multiprocessing
+import os
+import signal
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+import skinsight.batch
+import skinsight.pipeline
+from skinsight.batch import iter_images, load_checkpoint, write_parquet
+from skinsight.pipeline import config_fingerprint
+
+
+def _line(record_id, config=None, **fields):
+    record = {"id": record_id, "config": config or config_fingerprint(), "season": "True Winter"}
+    return json.dumps(dict(record, **fields)) + "\n"
+
+
+def _fingerprint_with(monkeypatch, name, value):
+    """The config fingerprint with one pipeline setting changed."""
+    with monkeypatch.context() as patch:
+        patch.setattr(skinsight.pipeline, name, value)
+        return config_fingerprint()
+
+
+@pytest.mark.parametrize("name, value", [
+    ("PIPELINE_VERSION", -1),
+    ("ILLUMINATION_MODE", "white_patch"),
+    ("DEFAULT_ENGINE", "histogram"),
+    ("DECODE_MAX_SIDE", 1),
+    ("DETECT_MAX_SIDE", 1),
+    ("QUALITY_GATE", None),
+])
+def test_checkpoint_skips_records_made_under_other_settings(tmp_path, monkeypatch, name, value):
+    path = tmp_path / "out.jsonl"
+    path.write_text(_line("a.jpg") + _line("b.jpg", config=_fingerprint_with(monkeypatch, name, value)))
+    assert load_checkpoint(str(path)) == {"a.jpg"}
+
+
+def test_fingerprint_covers_the_classifier_version(monkeypatch):
+    classifier = skinsight.pipeline.load_classifier()
+    stale = SimpleNamespace(version=f"{classifier.version}-retired")
+    assert _fingerprint_with(monkeypatch, "load_classifier", lambda: stale) != config_fingerprint()
+
+
+def test_checkpoint_truncates_a_partial_last_line(tmp_path):
+    path = tmp_path / "out.jsonl"
+    complete = _line("a.jpg") + _line("b.jpg")
+    path.write_text(complete + '{"id": "c.jpg", "pipe')
+    assert load_checkpoint(str(path)) == {"a.jpg", "b.jpg"}
+    assert path.read_text() == complete
+    # Appends after the truncation stay valid JSONL
+    with open(path, "a") as f:
+        f.write(_line("c.jpg"))
+    assert load_checkpoint(str(path)) == {"a.jpg", "b.jpg", "c.jpg"}
+
+
+def test_missing_checkpoint_is_empty(tmp_path):
+    assert load_checkpoint(str(tmp_path / "none.jsonl")) == set()
+
+
+def test_parquet_keeps_current_records_only(tmp_path, monkeypatch):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "out.jsonl"
+    stale = _fingerprint_with(monkeypatch, "PIPELINE_VERSION", -1)
+    path.write_text(_line("a.jpg", config=stale, old_field=1) + _line("a.jpg"))
+    write_parquet(str(path), str(tmp_path / "out.parquet"))
+    table = pq.read_table(tmp_path / "out.parquet")
+    assert table.column("id").to_pylist() == ["a.jpg"]
+    assert "old_field" not in table.column_names
+
+
+def test_iter_images_reads_directories_and_zips(tmp_path):
+    (tmp_path / "photos" / "sub").mkdir(parents=True)
+    (tmp_path / "photos" / "b.jpg").write_bytes(b"b")
+    (tmp_path / "photos" / "sub" / "a.PNG").write_bytes(b"a")
+    (tmp_path / "photos" / "notes.txt").write_bytes(b"-")
+    assert sorted(iter_images(str(tmp_path / "photos"))) == [("b.jpg", b"b"), ("sub/a.PNG", b"a")]
+
+    archive = tmp_path / "photos.zip"
+    with zipfile.ZipFile(archive, "w") as z:
+        z.writestr("x.jpeg", b"x")
+        z.writestr("readme.md", b"-")
+    assert list(iter_images(str(archive))) == [("x.jpeg", b"x")]
+
+
+def fake_process_image(name, data, all_faces=False):
+    if data == b"crash":
+        os.kill(os.getpid(), signal.SIGKILL)
+    return dict(skinsight.batch._empty_record(name), season="True Winter", seconds=0.0)
+
+
+def test_worker_crash_is_checkpointed_and_the_run_continues(tmp_path, monkeypatch):
+    monkeypatch.setattr(skinsight.batch, "process_image", fake_process_image)
+    monkeypatch.setattr(skinsight.batch, "_new_pool", lambda workers: ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("fork")))
+    photos = tmp_path / "photos"
+    photos.mkdir()
+    names = [f"{i:02d}.jpg" for i in range(12)]
+    for name in names:
+        (photos / name).write_bytes(b"crash" if name == "02.jpg" else b"ok")
+    output = str(tmp_path / "out.jsonl")
+
+    assert skinsight.batch.run(str(photos), output, workers=1, log=io.StringIO()) == len(names)
+    records = {record["id"]: record for record in map(json.loads, open(output))}
+    assert set(records) == set(names)
+    assert "worker process died" in records["02.jpg"]["error"]
+    # Images submitted after the crash run on the replacement pool
+    assert records["11.jpg"]["error"] is None
+    # Nothing is retried on resume
+    assert skinsight.batch.run(str(photos), output, workers=1, log=io.StringIO()) == 0
@@ -0,0 +1,64 @@
+import pickle
+
+from skinsight.cache import MISS, ResultCache, content_key
+
+
+def _size(value):
+    return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def test_evicts_least_recently_used_entry_over_count():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.put("c", 3)
+    assert cache.get("b") is MISS
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_evicts_until_under_byte_budget():
+    value = b"x" * 1000
+    cache = ResultCache(max_entries=100, max_bytes=_size(value) * 2)
+    for key in "abc":
+        cache.put(key, value)
+    assert len(cache) == 2
+    assert cache.get("a") is MISS
+    assert cache.stats()["bytes"] == _size(value) * 2
+
+
+def test_oversized_value_is_not_kept_in_memory():
+    cache = ResultCache(max_bytes=10)
+    cache.put("big", b"x" * 100)
+    assert len(cache) == 0
+    assert cache.get("big") is MISS
+
+
+def test_replacing_a_key_does_not_double_count_bytes():
+    cache = ResultCache()
+    cache.put("a", b"x" * 100)
+    cache.put("a", b"x" * 10)
+    assert cache.stats()["bytes"] == _size(b"x" * 10)
+
+
+def test_disk_store_survives_a_new_cache(tmp_path):
+    ResultCache(disk_dir=str(tmp_path)).put("k", {"season": "True Winter"})
+    fresh = ResultCache(disk_dir=str(tmp_path))
+    assert fresh.get("k") == {"season": "True Winter"}
+    assert fresh.stats()["disk_hits"] == 1
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_get_or_compute_computes_once_per_content_and_version():
+    cache = ResultCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert cache.get_or_compute(b"photo", 1, compute) == 1
+    assert cache.get_or_compute(b"photo", 1, compute) == 1
+    assert cache.get_or_compute(b"photo", 2, compute) == 2
+    assert content_key(b"photo", 1) != content_key(b"photo", 2)
@@ -0,0 +1,54 @@
+import json
+import re
+
+import numpy as np
+import pytest
+
+from skinsight.classifier import TABLE_PATH, SeasonClassifier, load_classifier, validate_table
+
+
+@pytest.fixture
+def table():
+    with open(TABLE_PATH) as f:
+        return json.load(f)
+
+
+def test_shipped_table_is_valid(table):
+    validate_table(table)
+
+
+@pytest.mark.parametrize("break_table, message", [
+    (lambda t: t["centroids"].update({"Neon Summer": t["centroids"]["True Winter"]}), "Neon Summer"),
+    (lambda t: t["centroids"]["True Winter"].append(1.0), "'True Winter' has 5 values"),
+    (lambda t: t["scale"].pop(), "one positive scale per feature"),
+    (lambda t: t["scale"].__setitem__(0, 0), "one positive scale per feature"),
+    (lambda t: t.pop("defaults"), "defaults for optional features: ['contrast']"),
+    (lambda t: t["features"].__setitem__(0, "freckles"), "unknown features: ['freckles']"),
+    (lambda t: t.pop("version"), "missing 'version'"),
+], ids=["unknown-season", "centroid-length", "scale-length", "scale-zero", "defaults", "feature", "version"])
+def test_broken_tables_are_rejected(table, break_table, message):
+    break_table(table)
+    with pytest.raises(ValueError, match=re.escape(message)):
+        SeasonClassifier(table)
+
+
+def test_score_rows_sum_to_one_and_rank_the_nearest_centroid_first(table):
+    classifier = SeasonClassifier(table)
+    centroids = np.array([table["centroids"][season] for season in classifier.seasons])
+    # Each centroid, nudged a little, must still score its own season highest
+    X = centroids + 0.1 * np.asarray(table["scale"])
+    scores = classifier.score(X)
+    assert scores.shape == (len(classifier.seasons), len(classifier.seasons))
+    assert np.allclose(scores.sum(axis=1), 1)
+    assert (scores.argmax(axis=1) == np.arange(len(classifier.seasons))).all()
+
+
+def test_vectorize_falls_back_to_defaults_and_classify_names_the_season():
+    classifier = load_classifier()
+    season = classifier.seasons[0]
+    features = dict(zip(classifier.features, np.array(classifier.centroids[0]) * classifier.scale))
+    contrast = features.pop("contrast", None)
+    x = classifier.vectorize(features, None)
+    assert x[classifier.features.index("contrast")] == classifier.defaults["contrast"]
+    best, scores = classifier.classify(classifier.vectorize(features, contrast))
+    assert best == season and scores[season] == max(scores.values())
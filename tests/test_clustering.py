@@ -0,0 +1,17 @@
+import numpy as np
+import pytest
+
+from skinsight.clustering import ENGINES, dominant_colors
+
+
+@pytest.mark.parametrize("engine", ["histogram", "subsample", "kmeans"])
+@pytest.mark.parametrize("pixels", [
+    np.tile([[10, 100, 200]], (50, 1)),
+    np.random.default_rng(0).integers(0, 180, (500, 3)),
+], ids=["one-colour", "noise"])
+def test_every_engine_returns_k_rows(engine, pixels):
+    assert engine in ENGINES
+    centers, weights = dominant_colors(pixels, k=3, engine=engine)
+    assert centers.shape == (3, 3) and weights.shape == (3,)
+    assert weights.sum() == pytest.approx(1.0)
+    assert (np.diff(weights) <= 0).all()
@@ -0,0 +1,38 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from skinsight.detection import detect_faces, face_roi
+
+pytest.importorskip("cv2")
+
+
+class StubDetector:
+    """Records the detection resolution and returns fixed boxes in its coordinates."""
+
+    def __init__(self, *rects):
+        self.rects = rects
+        self.calls = []
+
+    def __call__(self, gray, upsample=0):
+        self.calls.append((gray.shape, upsample))
+        return [SimpleNamespace(left=lambda r=r: r[0], top=lambda r=r: r[1],
+                                right=lambda r=r: r[2], bottom=lambda r=r: r[3]) for r in self.rects]
+
+
+def test_boxes_are_mapped_back_to_full_resolution_largest_first():
+    detector = StubDetector((10, 10, 30, 30), (100, 50, 200, 150))
+    boxes = detect_faces(np.zeros((1000, 2000, 3), dtype=np.uint8), detector, max_side=500)
+    assert detector.calls == [((250, 500), 0)]
+    assert boxes == [(400, 200, 800, 600), (40, 40, 120, 120)]
+
+
+def test_upsample_reaches_the_detector():
+    detector = StubDetector()
+    detect_faces(np.zeros((400, 400, 3), dtype=np.uint8), detector, upsample=1)
+    assert detector.calls == [((400, 400), 1)]
+
+
+def test_face_roi_is_clipped_to_the_image():
+    assert face_roi((0, 10, 100, 110), (200, 120)) == (0, 0, 120, 140)
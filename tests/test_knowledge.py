@@ -0,0 +1,60 @@
+import copy
+
+import pytest
+
+from skinsight.knowledge import compile_knowledge_base, load_raw
+
+
+@pytest.fixture
+def data():
+    return copy.deepcopy(load_raw())
+
+
+def test_shipped_knowledge_base_compiles(data):
+    kb = compile_knowledge_base(data)
+    assert set(kb.seasons) == set(data["seasons"])
+    season = next(iter(kb.seasons.values()))
+    assert season.colors[0].hex == data["seasons"][season.name]["color_hex"][0]
+    assert season.name in kb.by_color[season.colors[0].hex.upper()]
+
+
+def test_every_problem_is_reported_at_once(data):
+    first, second = list(data["seasons"])[:2]
+    category, occasions = next(iter(data["occasion_types"].items()))
+    occasion = occasions[0]
+    a, b = data["seasons"][first], data["seasons"][second]
+
+    a["color_reasons"].pop()                                   # paired lists drift apart
+    a["color_hex"][0] = "#12345"                               # bad hex code
+    a["hair_reasons"].append("extra reason")
+    a["avoid"].append("Chartreuse Haze")                       # no avoid swatch
+    a["occasions"]["Moon Landing"] = a["occasions"][occasion]  # unknown occasion
+    del b["occasions"][occasion]["male"]["grooming"]           # missing look key
+    b["makeup_male"] = b["makeup_reasons"] + ["Bold lip"]      # more male items than reasons
+    data["avoid_swatches"]["Gloom"] = "grey"
+    data["occasion_profiles"][occasion]["formality"] = 9
+    data["occasion_types"][category].append("Tea Ceremony")    # occasion without a profile
+
+    with pytest.raises(ValueError) as error:
+        compile_knowledge_base(data)
+    message = str(error.value)
+    for expected in (
+        f"{first}: colors, color_hex and color_reasons differ in length",
+        f"{first}: bad hex code '#12345'",
+        f"{first}: {len(a['hair'])} hair but {len(a['hair_reasons'])} hair_reasons",
+        f"{first}: avoid entry 'Chartreuse Haze' has no avoid_swatches colour",
+        f"{first}: occasion 'Moon Landing' is not in occasion_types",
+        f"{second}/{occasion}/male: missing grooming",
+        f"{second}: {len(b['makeup_male'])} makeup_male but {len(b['makeup_reasons'])} makeup_reasons",
+        "avoid_swatches: bad hex code 'grey' for 'Gloom'",
+        f"occasion {occasion!r}: formality must be 1-5",
+        "occasion 'Tea Ceremony' has no occasion_profiles entry",
+    ):
+        assert expected in message
+
+
+def test_season_missing_keys_is_reported(data):
+    name = next(iter(data["seasons"]))
+    del data["seasons"][name]["description"], data["seasons"][name]["avoid"]
+    with pytest.raises(ValueError, match=f"{name}: missing description, avoid"):
+        compile_knowledge_base(data)
@@ -0,0 +1,44 @@
+import threading
+import tracemalloc
+
+import numpy as np
+
+from skinsight.profiling import Profile
+
+
+def test_traced_stage_reports_its_peak_and_stops_tracing():
+    profile = Profile(trace_memory=True)
+    with profile.stage("alloc"):
+        buffer = np.ones(1_000_000)
+        del buffer
+    assert profile.stages["alloc"]["peak_bytes"] >= 8_000_000
+    assert not tracemalloc.is_tracing()
+
+
+def test_concurrent_traced_stages_do_not_stop_each_others_tracing():
+    inside = threading.Event()
+    release = threading.Event()
+    seen = {}
+
+    def slow():
+        with Profile(trace_memory=True).stage("slow"):
+            inside.set()
+            release.wait(5)
+            seen["tracing"] = tracemalloc.is_tracing()
+
+    def fast():
+        with Profile(trace_memory=True).stage("fast"):
+            pass
+
+    slow_thread = threading.Thread(target=slow)
+    slow_thread.start()
+    inside.wait(5)
+    fast_thread = threading.Thread(target=fast)
+    fast_thread.start()
+    # The second stage waits for the first instead of stopping its tracing
+    fast_thread.join(0.2)
+    assert fast_thread.is_alive()
+    release.set()
+    slow_thread.join(5)
+    fast_thread.join(5)
+    assert seen["tracing"] and not tracemalloc.is_tracing()
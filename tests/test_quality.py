@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from skinsight.quality import assess, check_exposure
+
+pytest.importorskip("cv2")
+
+
+def _noisy(bgr, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.clip(np.full((400, 400, 3), bgr) + rng.normal(0, 12, (400, 400, 3)), 0, 255).astype(np.uint8)
+
+
+@pytest.mark.parametrize("skin", [(120, 160, 210), (90, 150, 190)], ids=["medium", "olive"])
+def test_skin_filled_frame_is_not_rejected_as_a_cast(skin):
+    report = assess(_noisy(skin))
+    assert report["ok"], report["problems"]
+    assert [warning["code"] for warning in report["warnings"]] == ["color_cast"]
+
+
+def test_neutral_frame_has_no_cast_warning():
+    report = assess(_noisy((128, 128, 128)))
+    assert report["ok"] and report["warnings"] == []
+
+
+def test_blurry_frame_is_rejected():
+    report = assess(np.full((400, 400, 3), 128, dtype=np.uint8))
+    assert not report["ok"]
+    assert [problem["code"] for problem in report["problems"]] == ["blurry"]
+
+
+def _portrait(backdrop):
+    """A well-lit face ellipse on a flat backdrop, and the face box."""
+    import cv2
+
+    image = np.full((600, 450, 3), backdrop, dtype=np.uint8)
+    cv2.ellipse(image, (225, 300), (110, 145), 0, 0, 360, (120, 160, 210), -1)
+    noise = np.random.default_rng(1).normal(0, 10, image.shape)
+    return np.clip(image + noise, 0, 255).astype(np.uint8), (140, 190, 310, 410)
+
+
+@pytest.mark.parametrize("backdrop", [255, 0], ids=["white", "black"])
+def test_backdrop_does_not_fail_exposure_on_the_face(backdrop):
+    image, box = _portrait(backdrop)
+    report = check_exposure(assess(image), image, box)
+    assert report["ok"], report["problems"]
+    assert report["metrics"]["exposure_region"] == "face"
+
+
+@pytest.mark.parametrize("backdrop, code", [(255, "overexposed"), (0, "underexposed")], ids=["white", "black"])
+def test_exposure_falls_back_to_the_frame_without_a_face(backdrop, code):
+    image, _ = _portrait(backdrop)
+    report = check_exposure(assess(image), image)
+    assert [problem["code"] for problem in report["problems"]] == [code]
+
+
+def test_dark_face_is_underexposed():
+    image, box = _portrait(128)
+    image = (image * 0.15).astype(np.uint8)
+    report = check_exposure(assess(image), image, box)
+    assert not report["ok"]
+    assert "underexposed" in [problem["code"] for problem in report["problems"]]
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from skinsight.extraction import polygons_pixels
+from skinsight.features import bgr_to_lab, skin_features
+from skinsight.regions import BROWS, LEFT_EYE, LIPS, RIGHT_EYE, region_polygons
+
+cv2 = pytest.importorskip("cv2")
+
+SKIN_BGR = (120, 160, 210)
+
+
+def _landmarks(left=100, top=100, size=300):
+    """A frontal 68-point layout (jaw, brows, nose, eyes, mouth) in a ``size`` box."""
+    points = [(0.5 - 0.475 * np.cos(a), 0.35 + 0.6 * np.sin(a)) for a in np.linspace(0, np.pi, 17)]
+    for start in (0.15, 0.61):
+        points += [(start + 0.06 * i, 0.25 - 0.03 * np.sin(np.pi * i / 4)) for i in range(5)]
+    points += [(0.5, 0.32 + 0.07 * i) for i in range(4)]
+    points += [(0.42 + 0.04 * i, 0.6) for i in range(5)]
+    for cx in (0.3, 0.7):
+        points += [(cx - 0.08 * np.cos(a), 0.375 - 0.03 * np.sin(a)) for a in np.linspace(0, 2 * np.pi, 7)[:-1]]
+    points += [(0.5 - 0.15 * np.cos(a), 0.75 - 0.06 * np.sin(a)) for a in np.linspace(0, 2 * np.pi, 13)[:-1]]
+    points += [(0.5 - 0.1 * np.cos(a), 0.75 - 0.03 * np.sin(a)) for a in np.linspace(0, 2 * np.pi, 9)[:-1]]
+    return np.rint(np.array(points) * size + (left, top)).astype(np.int32)
+
+
+def test_skin_regions_leave_out_eyes_brows_nostrils_and_lips():
+    landmarks = _landmarks()
+    image = np.full((500, 500, 3), SKIN_BGR, dtype=np.uint8)
+    for part in (BROWS, LEFT_EYE, RIGHT_EYE, LIPS, slice(31, 36)):
+        cv2.fillConvexPoly(image, cv2.convexHull(landmarks[part]), (30, 30, 40))
+    skin = np.concatenate(polygons_pixels(image, region_polygons(landmarks)["skin"]))
+    assert len(skin) > 1000
+    assert (skin == SKIN_BGR).all()
+
+
+def test_skin_mean_is_not_below_its_tenth_percentile():
+    landmarks = _landmarks()
+    rng = np.random.default_rng(0)
+    image = np.clip(np.full((500, 500, 3), SKIN_BGR) + rng.normal(0, 6, (500, 500, 3)), 0, 255).astype(np.uint8)
+    for part in (BROWS, LEFT_EYE, RIGHT_EYE, LIPS):
+        cv2.fillConvexPoly(image, cv2.convexHull(landmarks[part]), (30, 30, 40))
+    skin = np.concatenate(polygons_pixels(image, region_polygons(landmarks)["skin"]))
+    L, *_, L_std, L_p10, _ = skin_features(bgr_to_lab(skin))
+    assert L > L_p10 and L_std < 3
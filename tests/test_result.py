@@ -0,0 +1,29 @@
+import json
+
+from skinsight.result import AnalysisResult, FaceResult
+
+SEASONS = ("True Winter", "Bright Spring", "Soft Autumn")
+
+
+def _face(scores):
+    return FaceResult(
+        seasons=SEASONS, scores=dict(zip(SEASONS, scores)),
+        ranking=tuple(sorted(range(len(SEASONS)), key=lambda i: -scores[i])),
+        features={"L": 60.0}, dominant_colors=[[10, 100, 200]], weights=[1.0], face_box=(0, 0, 10, 10),
+        regions={}, contrast=None, illumination={"mode": "none", "gains": [1.0, 1.0, 1.0]},
+    )
+
+
+def test_face_ranks_and_measures_its_scores():
+    face = _face((0.2, 0.5, 0.3))
+    assert face.season == "Bright Spring"
+    assert face.confidence == 0.5
+    assert face.margin == 0.2
+    assert face.top(2) == [("Bright Spring", 0.5), ("Soft Autumn", 0.3)]
+
+
+def test_result_survives_a_json_round_trip():
+    result = AnalysisResult((_face((0.2, 0.5, 0.3)), _face((0.6, 0.1, 0.3))), {}, {"ok": True}, 15, 1)
+    data = json.loads(json.dumps(result.as_dict()))
+    assert AnalysisResult.from_dict(data) == result
+    assert data["scores"] == result.scores == {"True Winter": 0.2, "Bright Spring": 0.5, "Soft Autumn": 0.3}
@@ -0,0 +1,125 @@
+import asyncio
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import skinsight.service
+from skinsight.quality import ImageQualityError
+from skinsight.result import AnalysisResult, FaceResult
+from skinsight.service import AnalysisService, create_app
+
+pytest.importorskip("aiohttp")
+from aiohttp.test_utils import TestClient, TestServer  # noqa: E402
+
+
+def fake_analyze(data, all_faces=False):
+    """Stands in for ``analyze_bytes``; the body says what to do."""
+    command, _, arg = data.decode().partition(":")
+    if command == "slow":
+        time.sleep(float(arg))
+    elif command == "none":
+        return None
+    elif command == "blurry":
+        raise ImageQualityError({"ok": False, "metrics": {"sharpness": 1.0}, "warnings": [],
+                                 "problems": [{"code": "blurry", "message": "The photo is blurry."}]})
+    elif command == "corrupt":
+        raise ValueError("cannot decode image")
+    elif command == "crash":
+        os.kill(os.getpid(), signal.SIGKILL)
+    face = FaceResult(("True Winter", "Soft Autumn"), {"True Winter": 0.7, "Soft Autumn": 0.3}, (0, 1),
+                      {"L": 60.0}, [[10, 100, 200]], [1.0], (0, 0, 10, 10), {}, None,
+                      {"mode": "none", "gains": [1.0, 1.0, 1.0]})
+    return AnalysisResult((face,), {}, {"ok": True, "warnings": []}, 0, 0)
+
+
+def no_warm_up():
+    pass
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    """``serve(scenario, **create_app_kwargs)`` runs ``await scenario(client)`` against the service."""
+    monkeypatch.setattr(skinsight.service, "analyze_bytes", fake_analyze)
+    monkeypatch.setattr(skinsight.service, "warm_up", no_warm_up)
+    # Forked workers see the stubs above and skip init_worker's model loading
+    monkeypatch.setattr(AnalysisService, "_new_pool", lambda self: ProcessPoolExecutor(
+        max_workers=self.workers, mp_context=multiprocessing.get_context("fork")))
+
+    def run(scenario, workers=1, queue_size=0, timeout=5.0):
+        async def main():
+            async with TestClient(TestServer(create_app(workers, queue_size, timeout))) as client:
+                await scenario(client)
+        asyncio.run(main())
+    return run
+
+
+async def _health(client):
+    return await (await client.get("/healthz")).json()
+
+
+async def _settled(client):
+    """Health once every slot has been released."""
+    for _ in range(100):
+        health = await _health(client)
+        if health["in_flight"] == 0:
+            return health
+        await asyncio.sleep(0.05)
+    raise AssertionError(f"slots never released: {health}")
+
+
+def test_analysis_outcomes_map_to_status_codes(serve):
+    async def scenario(client):
+        response = await client.post("/analyze", data=b"ok")
+        assert response.status == 200
+        body = await response.json()
+        assert body["season"] == "True Winter" and body["scores"]["Soft Autumn"] == 0.3
+        assert body["recommendations"] is not None and body["warnings"] == []
+
+        assert (await client.post("/analyze", data=b"")).status == 400
+        assert (await client.post("/analyze", data=b"corrupt")).status == 400
+        assert (await client.post("/analyze", data=b"none")).status == 422
+        response = await client.post("/analyze", data=b"blurry")
+        assert response.status == 422
+        assert [p["code"] for p in (await response.json())["problems"]] == ["blurry"]
+        assert (await _settled(client))["in_flight"] == 0
+
+        metrics = await (await client.get("/metrics")).text()
+        for outcome in ("ok", "bad_request", "error", "no_face", "low_quality"):
+            assert f'skinsight_requests_total{{outcome="{outcome}"}} 1' in metrics
+    serve(scenario)
+
+
+def test_requests_over_capacity_get_429(serve):
+    async def scenario(client):
+        slow = asyncio.ensure_future(client.post("/analyze", data=b"slow:0.5"))
+        await asyncio.sleep(0.2)
+        response = await client.post("/analyze", data=b"ok")
+        assert response.status == 429 and response.headers["Retry-After"] == "1"
+        assert (await slow).status == 200
+        assert (await client.post("/analyze", data=b"ok")).status == 200
+    serve(scenario, workers=1, queue_size=0)
+
+
+def test_timed_out_analysis_keeps_its_slot_until_the_worker_finishes(serve):
+    async def scenario(client):
+        assert (await client.post("/analyze", data=b"slow:0.6")).status == 504
+        # The worker is still busy, so the slot is still taken
+        assert (await _health(client))["in_flight"] == 1
+        assert (await client.post("/analyze", data=b"ok")).status == 429
+        await _settled(client)
+        assert (await client.post("/analyze", data=b"ok")).status == 200
+    serve(scenario, timeout=0.2)
+
+
+def test_worker_crash_replaces_the_pool(serve):
+    async def scenario(client):
+        response = await client.post("/analyze", data=b"crash")
+        assert response.status == 503 and response.headers["Retry-After"] == "1"
+        health = await _settled(client)
+        assert health["pool_restarts"] == 1 and health["status"] == "ok"
+        assert (await client.post("/analyze", data=b"ok")).status == 200
+    serve(scenario, workers=2, queue_size=2)